@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import crud_async, schemas
+from .db import get_async_session
+from .pagination import after_id, with_next_cursor
+
+# Async replacements for the CRUD routes in app/main.py, mounted when
+# ASYNC_DATABASE is enabled. Paths, parameters and responses are identical.
+router = APIRouter()
+
+
+# Students
+@router.post("/students", response_model=schemas.StudentRead)
+async def create_student(student: schemas.StudentCreate, db: AsyncSession = Depends(get_async_session)):
+	return await crud_async.create_student(db, student)
+
+
+@router.get("/students", response_model=list[schemas.StudentRead])
+async def list_students(
+	response: Response,
+	skip: int = 0,
+	limit: int = 100,
+	after: str | None = None,
+	db: AsyncSession = Depends(get_async_session),
+):
+	rows = await crud_async.list_students(db, skip, limit, after_id(after))
+	return with_next_cursor(response, rows, limit)
+
+
+@router.get("/students/{student_id}", response_model=schemas.StudentRead)
+async def get_student(student_id: int, db: AsyncSession = Depends(get_async_session)):
+	obj = await crud_async.get_student(db, student_id)
+	if not obj:
+		raise HTTPException(status_code=404, detail="Student not found")
+	return obj
+
+
+@router.delete("/students/{student_id}")
+async def delete_student(student_id: int, db: AsyncSession = Depends(get_async_session)):
+	ok = await crud_async.delete_student(db, student_id)
+	if not ok:
+		raise HTTPException(status_code=404, detail="Student not found")
+	return {"deleted": True}
+
+
+# Teachers
+@router.post("/teachers", response_model=schemas.TeacherRead)
+async def create_teacher(teacher: schemas.TeacherCreate, db: AsyncSession = Depends(get_async_session)):
+	return await crud_async.create_teacher(db, teacher)
+
+
+@router.get("/teachers", response_model=list[schemas.TeacherRead])
+async def list_teachers(
+	response: Response,
+	skip: int = 0,
+	limit: int = 100,
+	after: str | None = None,
+	db: AsyncSession = Depends(get_async_session),
+):
+	rows = await crud_async.list_teachers(db, skip, limit, after_id(after))
+	return with_next_cursor(response, rows, limit)
+
+
+@router.get("/teachers/{teacher_id}", response_model=schemas.TeacherRead)
+async def get_teacher(teacher_id: int, db: AsyncSession = Depends(get_async_session)):
+	obj = await crud_async.get_teacher(db, teacher_id)
+	if not obj:
+		raise HTTPException(status_code=404, detail="Teacher not found")
+	return obj
+
+
+@router.delete("/teachers/{teacher_id}")
+async def delete_teacher(teacher_id: int, db: AsyncSession = Depends(get_async_session)):
+	ok = await crud_async.delete_teacher(db, teacher_id)
+	if not ok:
+		raise HTTPException(status_code=404, detail="Teacher not found")
+	return {"deleted": True}
+
+
+# Courses
+@router.post("/courses", response_model=schemas.CourseRead)
+async def create_course(course: schemas.CourseCreate, db: AsyncSession = Depends(get_async_session)):
+	try:
+		return await crud_async.create_course(db, course)
+	except ValueError as e:
+		raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/courses", response_model=list[schemas.CourseRead])
+async def list_courses(
+	response: Response,
+	skip: int = 0,
+	limit: int = 100,
+	after: str | None = None,
+	db: AsyncSession = Depends(get_async_session),
+):
+	rows = await crud_async.list_courses(db, skip, limit, after_id(after))
+	return with_next_cursor(response, rows, limit)
+
+
+@router.get("/courses/{course_id}", response_model=schemas.CourseRead)
+async def get_course(course_id: int, db: AsyncSession = Depends(get_async_session)):
+	obj = await crud_async.get_course(db, course_id)
+	if not obj:
+		raise HTTPException(status_code=404, detail="Course not found")
+	return obj
+
+
+@router.delete("/courses/{course_id}")
+async def delete_course(course_id: int, db: AsyncSession = Depends(get_async_session)):
+	ok = await crud_async.delete_course(db, course_id)
+	if not ok:
+		raise HTTPException(status_code=404, detail="Course not found")
+	return {"deleted": True}
+
+
+# Enrollments
+@router.post("/enrollments", response_model=schemas.EnrollmentRead)
+async def create_enrollment(enrollment: schemas.EnrollmentCreate, db: AsyncSession = Depends(get_async_session)):
+	try:
+		return await crud_async.create_enrollment(db, enrollment)
+	except ValueError as e:
+		raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/enrollments", response_model=list[schemas.EnrollmentRead])
+async def list_enrollments(
+	response: Response,
+	skip: int = 0,
+	limit: int = 100,
+	after: str | None = None,
+	db: AsyncSession = Depends(get_async_session),
+):
+	rows = await crud_async.list_enrollments(db, skip, limit, after_id(after))
+	return with_next_cursor(response, rows, limit)
+
+
+@router.delete("/enrollments/{enrollment_id}")
+async def delete_enrollment(enrollment_id: int, db: AsyncSession = Depends(get_async_session)):
+	ok = await crud_async.delete_enrollment(db, enrollment_id)
+	if not ok:
+		raise HTTPException(status_code=404, detail="Enrollment not found")
+	return {"deleted": True}
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Protocol
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from .config import get_settings
+
+# Columns that change too often to cache; they are loaded from the database on
+# first access instead (enrolled_count moves with every admission).
+VOLATILE_COLUMNS: dict[str, frozenset[str]] = {
+	"courses": frozenset({"enrolled_count"}),
+}
+
+
+class CacheBackend(Protocol):
+	"""Storage used by EntityCache. Values are plain dicts of column values,
+	so a shared backend (e.g. Redis) only needs to serialise dicts."""
+
+	def get(self, key: str) -> dict | None: ...
+
+	def set(self, key: str, value: dict) -> None: ...
+
+	def delete(self, key: str) -> None: ...
+
+	def clear(self) -> None: ...
+
+	def __len__(self) -> int: ...
+
+
+class LRUCache:
+	"""In-process LRU with a per-entry TTL."""
+
+	def __init__(self, maxsize: int = 10_000, ttl: float = 60.0):
+		self.maxsize = maxsize
+		self.ttl = ttl
+		self._data: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+		self._lock = threading.Lock()
+
+	def get(self, key: str) -> dict | None:
+		with self._lock:
+			entry = self._data.get(key)
+			if entry is None:
+				return None
+			expires_at, value = entry
+			if expires_at < time.monotonic():
+				del self._data[key]
+				return None
+			self._data.move_to_end(key)
+			return value
+
+	def set(self, key: str, value: dict) -> None:
+		with self._lock:
+			self._data[key] = (time.monotonic() + self.ttl, value)
+			self._data.move_to_end(key)
+			while len(self._data) > self.maxsize:
+				self._data.popitem(last=False)
+
+	def delete(self, key: str) -> None:
+		with self._lock:
+			self._data.pop(key, None)
+
+	def clear(self) -> None:
+		with self._lock:
+			self._data.clear()
+
+	def __len__(self) -> int:
+		return len(self._data)
+
+
+class EntityCache:
+	"""Read-through cache for primary-key lookups of ORM entities.
+
+	Only column values are cached. A hit rebuilds a detached instance and merges
+	it into the caller's session with `load=False`, so no SELECT is issued and
+	the returned object behaves like one from `Session.get`.
+	"""
+
+	def __init__(self, backend: CacheBackend, enabled: bool = True):
+		self.backend = backend
+		self.enabled = enabled
+		self.hits = 0
+		self.misses = 0
+		self._lock = threading.Lock()
+
+	@staticmethod
+	def key(model, obj_id: int) -> str:
+		return f"{model.__tablename__}:{obj_id}"
+
+	def _count(self, hit: bool) -> None:
+		with self._lock:
+			if hit:
+				self.hits += 1
+			else:
+				self.misses += 1
+
+	@staticmethod
+	def _values(obj) -> dict:
+		mapper = inspect(obj).mapper
+		skip = VOLATILE_COLUMNS.get(mapper.local_table.name, frozenset())
+		return {
+			attr.key: getattr(obj, attr.key)
+			for attr in mapper.column_attrs
+			if attr.key not in skip
+		}
+
+	@staticmethod
+	def _detached(model, values: dict):
+		obj = model(**values)
+		make_transient_to_detached(obj)
+		return obj
+
+	def _lookup(self, model, obj_id: int) -> dict | None:
+		if not self.enabled:
+			return None
+		values = self.backend.get(self.key(model, obj_id))
+		self._count(values is not None)
+		return values
+
+	def _store(self, obj) -> None:
+		if self.enabled and obj is not None:
+			self.backend.set(self.key(type(obj), inspect(obj).identity[0]), self._values(obj))
+
+	def get(self, db: Session, model, obj_id: int):
+		values = self._lookup(model, obj_id)
+		if values is not None:
+			return db.merge(self._detached(model, values), load=False)
+		obj = db.get(model, obj_id)
+		self._store(obj)
+		return obj
+
+	async def aget(self, db: AsyncSession, model, obj_id: int):
+		values = self._lookup(model, obj_id)
+		if values is not None:
+			return await db.merge(self._detached(model, values), load=False)
+		obj = await db.get(model, obj_id)
+		self._store(obj)
+		return obj
+
+	def invalidate(self, model, *obj_ids: int) -> None:
+		for obj_id in obj_ids:
+			self.backend.delete(self.key(model, obj_id))
+
+	def clear(self) -> None:
+		self.backend.clear()
+		with self._lock:
+			self.hits = self.misses = 0
+
+	def stats(self) -> dict[str, Any]:
+		total = self.hits + self.misses
+		return {
+			"enabled": self.enabled,
+			"hits": self.hits,
+			"misses": self.misses,
+			"hit_ratio": round(self.hits / total, 4) if total else 0.0,
+			"size": len(self.backend),
+		}
+
+
+_entity_cache: EntityCache | None = None
+
+
+def get_entity_cache() -> EntityCache:
+	global _entity_cache
+	if _entity_cache is None:
+		settings = get_settings()
+		_entity_cache = EntityCache(
+			LRUCache(maxsize=settings.ENTITY_CACHE_SIZE, ttl=settings.ENTITY_CACHE_TTL),
+			enabled=settings.ENTITY_CACHE_ENABLED,
+		)
+	return _entity_cache
+
+
+def set_cache_backend(backend: CacheBackend) -> EntityCache:
+	"""Swap in a shared backend so several workers see the same entries."""
+	global _entity_cache
+	_entity_cache = EntityCache(backend, enabled=get_settings().ENTITY_CACHE_ENABLED)
+	return _entity_cache
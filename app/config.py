@@ -1,8 +1,39 @@
+from functools import lru_cache
+from typing import Any, Literal, Optional
+
 from pydantic_settings import BaseSettings
 
 
 class Settings(BaseSettings):
 	DATABASE_URL: str = "sqlite:///./sms.db"
+	# Serve the CRUD routes from async handlers on an AsyncEngine
+	ASYNC_DATABASE: bool = False
+	# Defaults to DATABASE_URL with its async driver (aiosqlite/asyncpg/aiomysql)
+	ASYNC_DATABASE_URL: Optional[str] = None
+
+	# Connection pool (ignored for in-memory SQLite)
+	DB_POOL_SIZE: int = 5
+	DB_MAX_OVERFLOW: int = 10
+	DB_POOL_TIMEOUT: float = 30.0
+	# Seconds before a pooled connection is replaced; -1 keeps connections forever
+	DB_POOL_RECYCLE: int = 1800
+	DB_POOL_PRE_PING: bool = True
+
+	# SQLite pragmas applied to every new connection
+	SQLITE_JOURNAL_MODE: Literal["DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"] = "WAL"
+	SQLITE_SYNCHRONOUS: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+	SQLITE_BUSY_TIMEOUT_MS: int = 5000
+	SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+	# Negative values are KiB, positive values are pages
+	SQLITE_CACHE_SIZE: int = -64000
+	# Statements slower than this are logged by app.db with their EXPLAIN plan;
+	# unset to disable
+	SLOW_QUERY_MS: Optional[float] = 500.0
+	SLOW_QUERY_EXPLAIN: bool = True
+	# Read-through cache for get_student/get_teacher/get_course
+	ENTITY_CACHE_ENABLED: bool = True
+	ENTITY_CACHE_SIZE: int = 10_000
+	ENTITY_CACHE_TTL: float = 60.0
 	APP_ENV: str = "development"
 	SCRAPER_USER_AGENT: str = (
 		"Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
@@ -13,5 +44,27 @@ class Settings(BaseSettings):
 		env_file_encoding = "utf-8"
 
 
+# Values layered over the environment by override_settings()
+_overrides: dict[str, Any] = {}
+
+
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-	return Settings()
\ No newline at end of file
+	"""Settings are read from the environment and `.env` once per process."""
+	return Settings(**_overrides)
+
+
+def override_settings(**values: Any) -> Settings:
+	"""Replace individual settings, e.g. a per-invocation DATABASE_URL.
+
+	Call `app.db.reset_engine()` afterwards if database settings changed.
+	"""
+	_overrides.update(values)
+	get_settings.cache_clear()
+	return get_settings()
+
+
+def reset_settings() -> None:
+	"""Drop overrides and re-read the environment on next use."""
+	_overrides.clear()
+	get_settings.cache_clear()
\ No newline at end of file
@@ -1,62 +1,166 @@
 from __future__ import annotations
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func
+from sqlalchemy import delete, func, insert, select, tuple_, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from . import models, schemas
+from .cache import get_entity_cache
+
+
+# Keeps composite-key IN lookups under SQLite's bound-parameter limit
+_TUPLE_LOOKUP_CHUNK = 400
+
+
+def paginate_statement(stmt, id_column, skip: int, limit: int, after: int | None):
+	"""Order `stmt` by `id_column` and cut one page out of it.
+
+	With `after` this is a keyset page (`WHERE id > after`), which stays fast at
+	any depth; otherwise `skip` falls back to OFFSET for older clients.
+	"""
+	stmt = stmt.order_by(id_column).limit(limit)
+	if after is not None:
+		return stmt.where(id_column > after)
+	return stmt.offset(skip)
+
+
+def page_query(model, skip: int, limit: int, after: int | None):
+	return paginate_statement(select(model), model.id, skip, limit, after)
+
+
+def list_rows_query(model, schema, skip: int, limit: int, after: int | None):
+	columns = [getattr(model, name) for name in schema.model_fields]
+	return paginate_statement(select(*columns), model.id, skip, limit, after)
+
+
+def list_rows(
+	db: Session, model, schema, skip: int = 0, limit: int = 100, after: int | None = None
+) -> list:
+	"""One page of `model` as row tuples holding exactly the fields of `schema`.
+
+	Skips ORM instance construction for list endpoints that only serialise.
+	"""
+	return db.execute(list_rows_query(model, schema, skip, limit, after)).all()
+
+
+def _paginate(db: Session, model, skip: int, limit: int, after: int | None):
+	return db.execute(page_query(model, skip, limit, after)).scalars().all()
+
+
+def _insert_people(db: Session, model, schema, items: list[schemas.PersonBase], commit: bool) -> list[dict]:
+	"""Insert people in one batched statement and return them shaped like `schema`.
+
+	Where executemany RETURNING is supported the stored rows come straight back
+	from the INSERT, so nothing is read back afterwards. Rows are returned in
+	id order, which is insertion order.
+	"""
+	table = model.__table__
+	rows = [item.model_dump() for item in items]
+	if not rows:
+		return []
+	if db.get_bind().dialect.insert_executemany_returning:
+		# No sort_by_parameter_order: SQLite has no sentinel for it and would
+		# degrade to one INSERT per row
+		result = db.execute(insert(table).returning(*(table.c[name] for name in schema.model_fields)), rows)
+		created = sorted((row._asdict() for row in result), key=lambda row: row["id"])
+	else:
+		# e.g. MySQL: no RETURNING, fall back to one INSERT per row in the same transaction
+		created = []
+		for row in rows:
+			result = db.execute(insert(table), row)
+			values = {**row, **result.last_inserted_params(), "id": result.inserted_primary_key[0]}
+			created.append({name: values[name] for name in schema.model_fields})
+	if commit:
+		db.commit()
+	return created
 
 
 # Students
 
+def create_students_bulk(
+	db: Session, items: list[schemas.StudentCreate], commit: bool = True
+) -> list[dict]:
+	return _insert_people(db, models.Student, schemas.StudentRead, items, commit)
+
+
 def create_student(db: Session, data: schemas.StudentCreate) -> models.Student:
 	student = models.Student(first_name=data.first_name, last_name=data.last_name)
 	db.add(student)
 	db.commit()
 	db.refresh(student)
+	get_entity_cache().invalidate(models.Student, student.id)
 	return student
 
 
 def get_student(db: Session, student_id: int) -> models.Student | None:
-	return db.get(models.Student, student_id)
+	return get_entity_cache().get(db, models.Student, student_id)
 
 
-def list_students(db: Session, skip: int = 0, limit: int = 100) -> list[models.Student]:
-	return db.execute(select(models.Student).offset(skip).limit(limit)).scalars().all()
+def list_students(
+	db: Session, skip: int = 0, limit: int = 100, after: int | None = None
+) -> list[models.Student]:
+	return _paginate(db, models.Student, skip, limit, after)
 
 
-def delete_student(db: Session, student_id: int) -> bool:
-	student = get_student(db, student_id)
-	if not student:
+def _delete_by_id(db: Session, model, obj_id: int) -> bool:
+	"""One DELETE; ON DELETE CASCADE removes dependent rows in the database."""
+	deleted = db.execute(
+		delete(model).where(model.id == obj_id).execution_options(synchronize_session=False)
+	).rowcount
+	if not deleted:
+		db.rollback()
 		return False
-	db.delete(student)
 	db.commit()
+	get_entity_cache().invalidate(model, obj_id)
 	return True
 
 
+def delete_student(db: Session, student_id: int) -> bool:
+	# Release the student's seats before the cascade removes the enrollments
+	db.execute(release_student_seats(student_id))
+	return _delete_by_id(db, models.Student, student_id)
+
+
 # Teachers
 
+def create_teachers_bulk(
+	db: Session, items: list[schemas.TeacherCreate], commit: bool = True
+) -> list[dict]:
+	return _insert_people(db, models.Teacher, schemas.TeacherRead, items, commit)
+
+
 def create_teacher(db: Session, data: schemas.TeacherCreate) -> models.Teacher:
 	teacher = models.Teacher(first_name=data.first_name, last_name=data.last_name)
 	db.add(teacher)
 	db.commit()
 	db.refresh(teacher)
+	get_entity_cache().invalidate(models.Teacher, teacher.id)
 	return teacher
 
 
 def get_teacher(db: Session, teacher_id: int) -> models.Teacher | None:
-	return db.get(models.Teacher, teacher_id)
+	return get_entity_cache().get(db, models.Teacher, teacher_id)
+
+
+def list_teachers(
+	db: Session, skip: int = 0, limit: int = 100, after: int | None = None
+) -> list[models.Teacher]:
+	return _paginate(db, models.Teacher, skip, limit, after)
 
 
-def list_teachers(db: Session, skip: int = 0, limit: int = 100) -> list[models.Teacher]:
-	return db.execute(select(models.Teacher).offset(skip).limit(limit)).scalars().all()
+def teacher_course_ids(teacher_id: int):
+	return select(models.Course.id).where(models.Course.teacher_id == teacher_id)
 
 
 def delete_teacher(db: Session, teacher_id: int) -> bool:
-	teacher = get_teacher(db, teacher_id)
-	if not teacher:
+	# The cascade removes the teacher's courses too; collect their ids for the cache
+	course_ids = list(db.execute(teacher_course_ids(teacher_id)).scalars())
+	if not _delete_by_id(db, models.Teacher, teacher_id):
 		return False
-	db.delete(teacher)
-	db.commit()
+	get_entity_cache().invalidate(models.Course, *course_ids)
 	return True
 
 
@@ -65,86 +169,456 @@ def delete_teacher(db: Session, teacher_id: int) -> bool:
 def create_course(db: Session, data: schemas.CourseCreate) -> models.Course:
 	course = models.Course(title=data.title, capacity=data.capacity, teacher_id=data.teacher_id)
 	db.add(course)
-	db.commit()
+	try:
+		db.commit()
+	except IntegrityError:
+		db.rollback()
+		# The foreign key rejected it; only the failure path looks the teacher up
+		if data.teacher_id is not None and db.get(models.Teacher, data.teacher_id) is None:
+			raise ValueError("Teacher not found")
+		raise
 	db.refresh(course)
+	get_entity_cache().invalidate(models.Course, course.id)
 	return course
 
 
 def get_course(db: Session, course_id: int) -> models.Course | None:
-	return db.get(models.Course, course_id)
-
-
-def list_courses(db: Session, skip: int = 0, limit: int = 100) -> list[models.Course]:
-	return db.execute(select(models.Course).offset(skip).limit(limit)).scalars().all()
+	return get_entity_cache().get(db, models.Course, course_id)
+
+
+def list_courses(
+	db: Session, skip: int = 0, limit: int = 100, after: int | None = None
+) -> list[models.Course]:
+	return _paginate(db, models.Course, skip, limit, after)
+
+
+def course_overview_query(skip: int, limit: int, after: int | None):
+	stmt = select(
+		models.Course.id,
+		models.Course.title,
+		models.Course.capacity,
+		models.Course.teacher_id,
+		models.Course.enrolled_count,
+		models.Teacher.first_name,
+		models.Teacher.last_name,
+	).outerjoin(models.Teacher, models.Course.teacher_id == models.Teacher.id)
+	return paginate_statement(stmt, models.Course.id, skip, limit, after)
+
+
+def list_course_overview(
+	db: Session, skip: int = 0, limit: int = 100, after: int | None = None
+) -> list[schemas.CourseOverview]:
+	"""Courses with their teacher's name and seat usage in a single query.
+
+	Seat usage comes from the maintained `enrolled_count`, so neither the
+	enrollments nor the teacher relationship is loaded per course.
+	"""
+	rows = db.execute(course_overview_query(skip, limit, after))
+	return [
+		schemas.CourseOverview(
+			id=row.id,
+			title=row.title,
+			capacity=row.capacity,
+			teacher_id=row.teacher_id,
+			teacher_full_name=f"{row.first_name} {row.last_name}" if row.teacher_id is not None else None,
+			enrolled_count=row.enrolled_count,
+			seats_remaining=max(row.capacity - row.enrolled_count, 0),
+		)
+		for row in rows
+	]
 
 
 def delete_course(db: Session, course_id: int) -> bool:
-	course = get_course(db, course_id)
-	if not course:
-		return False
-	db.delete(course)
-	db.commit()
-	return True
+	return _delete_by_id(db, models.Course, course_id)
 
 
 # Enrollments with business rules
 
-def create_enrollment(db: Session, data: schemas.EnrollmentCreate) -> models.Enrollment:
-	# Prevent duplicates
-	exists = db.execute(
-		select(models.Enrollment).where(
-			models.Enrollment.student_id == data.student_id,
-			models.Enrollment.course_id == data.course_id,
+def enrollment_lookup(data: schemas.EnrollmentCreate):
+	return select(models.Enrollment.id).where(
+		models.Enrollment.student_id == data.student_id,
+		models.Enrollment.course_id == data.course_id,
+	)
+
+
+def enrollment_pairs_lookup(pairs: list[tuple[int, int]]):
+	"""Existing (student_id, course_id) rows among `pairs`.
+
+	A row-value IN alone makes SQLite scan the whole of uq_student_course, so
+	one IN list per column drives an index search and the row-value IN only
+	trims the extra combinations.
+	"""
+	model = models.Enrollment
+	return select(model.student_id, model.course_id).where(
+		model.student_id.in_({s for s, _ in pairs}),
+		model.course_id.in_({c for _, c in pairs}),
+		tuple_(model.student_id, model.course_id).in_(pairs),
+	)
+
+
+def claim_seat(course_id: int):
+	"""UPDATE taking one seat; matches no row when the course is full or missing."""
+	return (
+		update(models.Course)
+		.where(
+			models.Course.id == course_id,
+			models.Course.enrolled_count < models.Course.capacity,
 		)
-	).scalar_one_or_none()
-	if exists:
-		raise ValueError("Student already enrolled in this course")
-
-	# Enforce capacity
-	count = db.execute(
-		select(func.count(models.Enrollment.id)).where(
-			models.Enrollment.course_id == data.course_id
+		.values(enrolled_count=models.Course.enrolled_count + 1)
+		.execution_options(synchronize_session=False)
+	)
+
+
+def release_seat(course_id: int):
+	return (
+		update(models.Course)
+		.where(models.Course.id == course_id)
+		.values(enrolled_count=models.Course.enrolled_count - 1)
+		.execution_options(synchronize_session=False)
+	)
+
+
+def release_student_seats(student_id: int):
+	"""UPDATE giving back every seat held by a student."""
+	return (
+		update(models.Course)
+		.where(
+			models.Course.id.in_(
+				select(models.Enrollment.course_id).where(models.Enrollment.student_id == student_id)
+			)
 		)
-	).scalar_one()
-	course = get_course(db, data.course_id)
+		.values(enrolled_count=models.Course.enrolled_count - 1)
+		.execution_options(synchronize_session=False)
+	)
+
+
+def _enrollment_rejection(db: Session, data: schemas.EnrollmentCreate) -> str:
+	"""Explain why an admission failed; only runs on the rejection path."""
+	duplicate = db.execute(enrollment_lookup(data)).first()
+	if duplicate:
+		return "Student already enrolled in this course"
+	course = db.get(models.Course, data.course_id)
 	if course is None:
-		raise ValueError("Course not found")
-	if count >= course.capacity:
-		raise ValueError("Course capacity reached")
+		return "Course not found"
+	if course.enrolled_count >= course.capacity:
+		return "Course capacity reached"
+	if db.get(models.Student, data.student_id) is None:
+		return "Student not found"
+	return "Enrollment rejected"
+
 
+def create_enrollment(db: Session, data: schemas.EnrollmentCreate) -> models.Enrollment:
+	# Claim a seat atomically: the guard in the WHERE clause means concurrent
+	# requests can never push enrolled_count past capacity.
+	claimed = db.execute(claim_seat(data.course_id)).rowcount
+	if not claimed:
+		db.rollback()
+		raise ValueError(_enrollment_rejection(db, data))
+
+	# Duplicates are caught by uq_student_course; rolling back releases the seat
 	enrollment = models.Enrollment(student_id=data.student_id, course_id=data.course_id)
 	db.add(enrollment)
+	try:
+		db.flush()
+	except IntegrityError:
+		db.rollback()
+		raise ValueError(_enrollment_rejection(db, data))
+	# Detach so the committed row is returned without a refresh SELECT
+	db.expunge(enrollment)
 	db.commit()
-	db.refresh(enrollment)
 	return enrollment
 
 
-def list_enrollments(db: Session, skip: int = 0, limit: int = 100) -> list[models.Enrollment]:
-	return db.execute(select(models.Enrollment).offset(skip).limit(limit)).scalars().all()
+def _insert_enrollments(db: Session, pairs: list[tuple[int, int]]) -> dict[tuple[int, int], int]:
+	"""Insert unique (student_id, course_id) pairs in one executemany; ids keyed by pair.
+
+	Ids are matched back by pair rather than by position: sort_by_parameter_order
+	has no sentinel on SQLite and would degrade to one INSERT per row.
+	"""
+	table = models.Enrollment.__table__
+	rows = [{"student_id": student_id, "course_id": course_id} for student_id, course_id in pairs]
+	if not rows:
+		return {}
+	if db.get_bind().dialect.insert_executemany_returning:
+		result = db.execute(insert(table).returning(table.c.id, table.c.student_id, table.c.course_id), rows)
+		return {(row.student_id, row.course_id): row.id for row in result}
+	# e.g. MySQL: no RETURNING, fall back to one INSERT per row in the same transaction
+	return {
+		(row["student_id"], row["course_id"]): db.execute(insert(table), row).inserted_primary_key[0]
+		for row in rows
+	}
+
+
+def create_enrollments_bulk(
+	db: Session, items: list[schemas.EnrollmentCreate]
+) -> schemas.EnrollmentBulkResult:
+	"""Admit many (student, course) pairs with set-based rule checks.
+
+	Courses, students and existing enrollments are each loaded with one query,
+	seats are claimed with one guarded UPDATE per course and all accepted rows
+	are inserted in a single transaction. Rejection reasons match the messages
+	raised by `create_enrollment`.
+	"""
+	course_ids = {i.course_id for i in items}
+	student_ids = {i.student_id for i in items}
+	courses = {
+		row.id: row
+		for row in db.execute(
+			select(models.Course.id, models.Course.capacity, models.Course.enrolled_count)
+			.where(models.Course.id.in_(course_ids))
+			.with_for_update()
+		)
+	}
+	known_students = set(
+		db.execute(select(models.Student.id).where(models.Student.id.in_(student_ids))).scalars()
+	)
+	pairs = list({(i.student_id, i.course_id) for i in items})
+	taken: set[tuple[int, int]] = set()
+	for start in range(0, len(pairs), _TUPLE_LOOKUP_CHUNK):
+		chunk = pairs[start:start + _TUPLE_LOOKUP_CHUNK]
+		taken.update(db.execute(enrollment_pairs_lookup(chunk)).tuples())
+
+	results: list[schemas.EnrollmentBulkItemResult] = []
+	claims: dict[int, list[schemas.EnrollmentBulkItemResult]] = {}
+	for item in items:
+		result = schemas.EnrollmentBulkItemResult(
+			student_id=item.student_id, course_id=item.course_id, accepted=False
+		)
+		results.append(result)
+		key = (item.student_id, item.course_id)
+		course = courses.get(item.course_id)
+		if key in taken:
+			result.reason = "Student already enrolled in this course"
+		elif course is None:
+			result.reason = "Course not found"
+		elif course.enrolled_count + len(claims.get(course.id, ())) >= course.capacity:
+			result.reason = "Course capacity reached"
+		elif item.student_id not in known_students:
+			result.reason = "Student not found"
+		else:
+			result.accepted = True
+			taken.add(key)
+			claims.setdefault(course.id, []).append(result)
+
+	for course_id, claimed in claims.items():
+		# Re-checked in SQL so a concurrent admission can never overfill the course
+		updated = db.execute(
+			update(models.Course)
+			.where(
+				models.Course.id == course_id,
+				models.Course.enrolled_count + len(claimed) <= models.Course.capacity,
+			)
+			.values(enrolled_count=models.Course.enrolled_count + len(claimed))
+			.execution_options(synchronize_session=False)
+		).rowcount
+		if not updated:
+			for result in claimed:
+				result.accepted = False
+				result.reason = "Course capacity reached"
+
+	accepted = [r for r in results if r.accepted]
+	try:
+		ids = _insert_enrollments(db, [(r.student_id, r.course_id) for r in accepted])
+	except IntegrityError:
+		db.rollback()
+		raise ValueError("Enrollments changed concurrently, please retry")
+	db.commit()
+	for result in accepted:
+		result.enrollment_id = ids[(result.student_id, result.course_id)]
+	return schemas.EnrollmentBulkResult(
+		accepted=len(accepted), rejected=len(results) - len(accepted), results=results
+	)
+
+
+def list_enrollments(
+	db: Session, skip: int = 0, limit: int = 100, after: int | None = None
+) -> list[models.Enrollment]:
+	return _paginate(db, models.Enrollment, skip, limit, after)
+
+
+def course_enrollments_delete(course_id: int):
+	return (
+		delete(models.Enrollment)
+		.where(models.Enrollment.course_id == course_id)
+		.execution_options(synchronize_session=False)
+	)
+
+
+def delete_course_enrollments(db: Session, course_id: int) -> int | None:
+	"""Remove every enrollment of a course and free its seats.
+
+	Returns the number of enrollments deleted, or None if the course does not
+	exist. Two statements whatever the course size.
+	"""
+	found = db.execute(
+		update(models.Course)
+		.where(models.Course.id == course_id)
+		.values(enrolled_count=0)
+		.execution_options(synchronize_session=False)
+	).rowcount
+	if not found:
+		db.rollback()
+		return None
+	deleted = db.execute(course_enrollments_delete(course_id)).rowcount
+	db.commit()
+	return deleted
 
 
 def delete_enrollment(db: Session, enrollment_id: int) -> bool:
 	enrollment = db.get(models.Enrollment, enrollment_id)
 	if not enrollment:
 		return False
+	db.execute(release_seat(enrollment.course_id))
 	db.delete(enrollment)
 	db.commit()
 	return True
 
 
-# Scraped resource insert
+# Scraped resource upsert
+
+# Columns refreshed when a (source, url) row is scraped again
+_SCRAPED_UPDATE_FIELDS = ("title", "category_or_author", "price", "price_amount", "currency")
+
+
+def scraped_keys_lookup(keys: list[tuple[str, str]]):
+	"""Current update fields of the rows whose (source, url) is in `keys`.
 
-def insert_scraped_resources(db: Session, items: list[schemas.ScrapedResourceCreate]) -> int:
-	objects = [
-		models.ScrapedResource(
-			source=i.source,
-			title=i.title,
-			url=i.url,
-			category_or_author=i.category_or_author,
-			price=i.price,
+	Searches uq_scraped_source_url the same way as `enrollment_pairs_lookup`.
+	"""
+	model = models.ScrapedResource
+	return select(model.source, model.url, *(getattr(model, f) for f in _SCRAPED_UPDATE_FIELDS)).where(
+		model.source.in_({source for source, _ in keys}),
+		model.url.in_({url for _, url in keys}),
+		tuple_(model.source, model.url).in_(keys),
+	)
+
+
+def _scraped_upsert_statement(db: Session):
+	"""Build a dialect-specific INSERT that updates on a (source, url) conflict."""
+	table = models.ScrapedResource.__table__
+	dialect = db.get_bind().dialect.name
+	if dialect == "mysql":
+		stmt = mysql_insert(table)
+		return stmt.on_duplicate_key_update(
+			{field: stmt.inserted[field] for field in _SCRAPED_UPDATE_FIELDS}
 		)
-		for i in items
-	]
-	db.add_all(objects)
+	if dialect == "postgresql":
+		stmt = postgresql_insert(table)
+	elif dialect == "sqlite":
+		stmt = sqlite_insert(table)
+	else:
+		raise ValueError(f"Upsert is not supported on {dialect}")
+	return stmt.on_conflict_do_update(
+		index_elements=["source", "url"],
+		set_={field: stmt.excluded[field] for field in _SCRAPED_UPDATE_FIELDS},
+	)
+
+
+def insert_scraped_resources(
+	db: Session, items: list[schemas.ScrapedResourceCreate]
+) -> schemas.ScrapedImportResult:
+	"""Upsert scraped items keyed on (source, url).
+
+	Existing rows are looked up in one query per chunk so unchanged items are
+	skipped entirely; new and changed rows go through a single executemany.
+	"""
+	result = schemas.ScrapedImportResult()
+	# The last occurrence of a key within one batch wins
+	rows = {(i.source, i.url): i.model_dump() for i in items}
+	if not rows:
+		return result
+
+	model = models.ScrapedResource
+	keys = list(rows)
+	existing: dict[tuple[str, str], tuple] = {}
+	for start in range(0, len(keys), _TUPLE_LOOKUP_CHUNK):
+		chunk = keys[start:start + _TUPLE_LOOKUP_CHUNK]
+		for source, url, *values in db.execute(scraped_keys_lookup(chunk)):
+			existing[(source, url)] = tuple(values)
+
+	pending = []
+	for key, row in rows.items():
+		current = existing.get(key)
+		if current is None:
+			result.inserted += 1
+		elif current != tuple(row[f] for f in _SCRAPED_UPDATE_FIELDS):
+			result.updated += 1
+		else:
+			result.unchanged += 1
+			continue
+		pending.append(row)
+
+	if pending:
+		db.execute(_scraped_upsert_statement(db), pending)
 	db.commit()
-	return len(objects)
\ No newline at end of file
+	return result
+
+
+def scraped_query(
+	skip: int = 0,
+	limit: int = 100,
+	after: int | None = None,
+	source: str | None = None,
+	category_or_author: str | None = None,
+	currency: str | None = None,
+	min_amount: int | None = None,
+	max_amount: int | None = None,
+):
+	model = models.ScrapedResource
+	stmt = select(*(getattr(model, name) for name in schemas.ScrapedResourceRead.model_fields))
+	for column, value in (
+		(model.source, source),
+		(model.category_or_author, category_or_author),
+		(model.currency, currency),
+	):
+		if value is not None:
+			stmt = stmt.where(column == value)
+	if min_amount is not None:
+		stmt = stmt.where(model.price_amount >= min_amount)
+	if max_amount is not None:
+		stmt = stmt.where(model.price_amount <= max_amount)
+	return paginate_statement(stmt, model.id, skip, limit, after)
+
+
+def list_scraped(db: Session, skip: int = 0, limit: int = 100, after: int | None = None, **filters) -> list:
+	"""A page of scraped resources as row tuples, optionally within a price range.
+
+	Filters are those of `scraped_query`. Price bounds are in minor units and
+	use the price_amount indexes.
+	"""
+	return db.execute(scraped_query(skip, limit, after, **filters)).all()
+
+
+def scraped_stats_query(source: str | None = None):
+	model = models.ScrapedResource
+	stmt = (
+		select(
+			model.source,
+			model.category_or_author,
+			model.currency,
+			func.count().label("count"),
+			func.min(model.price_amount).label("min_price_amount"),
+			func.max(model.price_amount).label("max_price_amount"),
+			func.avg(model.price_amount).label("avg_price_amount"),
+		)
+		.group_by(model.source, model.category_or_author, model.currency)
+		.order_by(model.source, model.category_or_author, model.currency)
+	)
+	if source is not None:
+		stmt = stmt.where(model.source == source)
+	return stmt
+
+
+def scraped_stats(db: Session, source: str | None = None) -> list[schemas.ScrapedCategoryStats]:
+	"""Item count and price min/max/avg per (source, category, currency), computed in SQL."""
+	return [
+		schemas.ScrapedCategoryStats(
+			**{
+				**row._asdict(),
+				"avg_price_amount": round(float(row.avg_price_amount), 2)
+				if row.avg_price_amount is not None
+				else None,
+			}
+		)
+		for row in db.execute(scraped_stats_query(source))
+	]
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import models, schemas
+from .cache import get_entity_cache
+from .crud import (
+	claim_seat,
+	enrollment_lookup,
+	page_query,
+	release_seat,
+	release_student_seats,
+	teacher_course_ids,
+)
+
+
+# Async mirrors of app/crud.py. Sessions come from AsyncSessionLocal, which does
+# not expire on commit, so created rows are returned without a refresh.
+
+
+async def _get(db: AsyncSession, model, obj_id: int):
+	return await get_entity_cache().aget(db, model, obj_id)
+
+
+async def _paginate(db: AsyncSession, model, skip: int, limit: int, after: int | None):
+	return (await db.execute(page_query(model, skip, limit, after))).scalars().all()
+
+
+async def _delete(db: AsyncSession, model, obj_id: int) -> bool:
+	# One DELETE; ON DELETE CASCADE removes dependent rows in the database
+	deleted = (
+		await db.execute(
+			delete(model).where(model.id == obj_id).execution_options(synchronize_session=False)
+		)
+	).rowcount
+	if not deleted:
+		await db.rollback()
+		return False
+	await db.commit()
+	get_entity_cache().invalidate(model, obj_id)
+	return True
+
+
+async def _add(db: AsyncSession, obj):
+	db.add(obj)
+	await db.commit()
+	get_entity_cache().invalidate(type(obj), obj.id)
+	return obj
+
+
+# Students
+
+async def create_student(db: AsyncSession, data: schemas.StudentCreate) -> models.Student:
+	return await _add(db, models.Student(first_name=data.first_name, last_name=data.last_name))
+
+
+async def get_student(db: AsyncSession, student_id: int) -> models.Student | None:
+	return await _get(db, models.Student, student_id)
+
+
+async def list_students(
+	db: AsyncSession, skip: int = 0, limit: int = 100, after: int | None = None
+) -> list[models.Student]:
+	return await _paginate(db, models.Student, skip, limit, after)
+
+
+async def delete_student(db: AsyncSession, student_id: int) -> bool:
+	# Release the student's seats before the cascade removes the enrollments
+	await db.execute(release_student_seats(student_id))
+	return await _delete(db, models.Student, student_id)
+
+
+# Teachers
+
+async def create_teacher(db: AsyncSession, data: schemas.TeacherCreate) -> models.Teacher:
+	return await _add(db, models.Teacher(first_name=data.first_name, last_name=data.last_name))
+
+
+async def get_teacher(db: AsyncSession, teacher_id: int) -> models.Teacher | None:
+	return await _get(db, models.Teacher, teacher_id)
+
+
+async def list_teachers(
+	db: AsyncSession, skip: int = 0, limit: int = 100, after: int | None = None
+) -> list[models.Teacher]:
+	return await _paginate(db, models.Teacher, skip, limit, after)
+
+
+async def delete_teacher(db: AsyncSession, teacher_id: int) -> bool:
+	# The cascade removes the teacher's courses too; collect their ids for the cache
+	course_ids = list((await db.execute(teacher_course_ids(teacher_id))).scalars())
+	if not await _delete(db, models.Teacher, teacher_id):
+		return False
+	get_entity_cache().invalidate(models.Course, *course_ids)
+	return True
+
+
+# Courses
+
+async def create_course(db: AsyncSession, data: schemas.CourseCreate) -> models.Course:
+	try:
+		return await _add(
+			db, models.Course(title=data.title, capacity=data.capacity, teacher_id=data.teacher_id)
+		)
+	except IntegrityError:
+		await db.rollback()
+		if data.teacher_id is not None and await db.get(models.Teacher, data.teacher_id) is None:
+			raise ValueError("Teacher not found")
+		raise
+
+
+async def get_course(db: AsyncSession, course_id: int) -> models.Course | None:
+	return await _get(db, models.Course, course_id)
+
+
+async def list_courses(
+	db: AsyncSession, skip: int = 0, limit: int = 100, after: int | None = None
+) -> list[models.Course]:
+	return await _paginate(db, models.Course, skip, limit, after)
+
+
+async def delete_course(db: AsyncSession, course_id: int) -> bool:
+	return await _delete(db, models.Course, course_id)
+
+
+# Enrollments with business rules
+
+async def _enrollment_rejection(db: AsyncSession, data: schemas.EnrollmentCreate) -> str:
+	if (await db.execute(enrollment_lookup(data))).first():
+		return "Student already enrolled in this course"
+	course = await db.get(models.Course, data.course_id)
+	if course is None:
+		return "Course not found"
+	if course.enrolled_count >= course.capacity:
+		return "Course capacity reached"
+	if await db.get(models.Student, data.student_id) is None:
+		return "Student not found"
+	return "Enrollment rejected"
+
+
+async def create_enrollment(db: AsyncSession, data: schemas.EnrollmentCreate) -> models.Enrollment:
+	# Same atomic admission as crud.create_enrollment
+	claimed = (await db.execute(claim_seat(data.course_id))).rowcount
+	if not claimed:
+		await db.rollback()
+		raise ValueError(await _enrollment_rejection(db, data))
+
+	enrollment = models.Enrollment(student_id=data.student_id, course_id=data.course_id)
+	db.add(enrollment)
+	try:
+		await db.commit()
+	except IntegrityError:
+		await db.rollback()
+		raise ValueError(await _enrollment_rejection(db, data))
+	return enrollment
+
+
+async def list_enrollments(
+	db: AsyncSession, skip: int = 0, limit: int = 100, after: int | None = None
+) -> list[models.Enrollment]:
+	return await _paginate(db, models.Enrollment, skip, limit, after)
+
+
+async def delete_enrollment(db: AsyncSession, enrollment_id: int) -> bool:
+	enrollment = await db.get(models.Enrollment, enrollment_id)
+	if not enrollment:
+		return False
+	await db.execute(release_seat(enrollment.course_id))
+	await db.delete(enrollment)
+	await db.commit()
+	return True
@@ -1,25 +1,275 @@
 from __future__ import annotations
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+import argparse
+import hashlib
+import logging
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator
+
+from sqlalchemy import (
+	Column,
+	DateTime,
+	ForeignKeyConstraint,
+	Integer,
+	MetaData,
+	String,
+	Table,
+	UniqueConstraint,
+	bindparam,
+	create_engine,
+	event,
+	inspect,
+	select,
+	text,
+	update,
+)
+from sqlalchemy.engine import Connection, Engine, make_url
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.schema import AddConstraint, CreateColumn, CreateIndex, CreateTable
+from sqlalchemy.ext.asyncio import AsyncAttrs, AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, DeclarativeBase
+from sqlalchemy.pool import QueuePool
 from .config import get_settings
+from .metrics import record_query
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger(f"{__name__}.slow_query")
 
+# Async driver used for each backend when ASYNC_DATABASE_URL is not set
+ASYNC_DRIVERS = {
+	"sqlite": "sqlite+aiosqlite",
+	"postgresql": "postgresql+asyncpg",
+	"mysql": "mysql+aiomysql",
+}
 
-class Base(DeclarativeBase):
+
+class Base(AsyncAttrs, DeclarativeBase):
 	pass
 
 
+def _is_sqlite(url: str) -> bool:
+	return make_url(url).get_backend_name() == "sqlite"
+
+
+def _pool_options(url: str) -> dict:
+	settings = get_settings()
+	options = {"pool_pre_ping": settings.DB_POOL_PRE_PING, "pool_recycle": settings.DB_POOL_RECYCLE}
+	# Only queue pools can be sized. SQLite gets a single shared connection in
+	# memory and, with aiosqlite, a NullPool for files.
+	parsed = make_url(url)
+	if not issubclass(parsed.get_dialect().get_pool_class(parsed), QueuePool):
+		return options
+	options.update(
+		pool_size=settings.DB_POOL_SIZE,
+		max_overflow=settings.DB_MAX_OVERFLOW,
+		pool_timeout=settings.DB_POOL_TIMEOUT,
+	)
+	return options
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+	settings = get_settings()
+	cursor = dbapi_connection.cursor()
+	# WAL lets readers proceed while a writer commits; NORMAL sync is safe with WAL
+	cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+	cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+	cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+	cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+	cursor.execute(f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}")
+	# Off by default in SQLite; the models rely on ON DELETE CASCADE
+	cursor.execute("PRAGMA foreign_keys=ON")
+	cursor.close()
+
+
+class QueryLog:
+	"""Statements executed while a `capture_queries()` block is active."""
+
+	def __init__(self):
+		self.statements: list[str] = []
+
+	@property
+	def count(self) -> int:
+		return len(self.statements)
+
+	def repeated(self, min_repeats: int = 2) -> dict[str, int]:
+		"""Identical SQL run at least `min_repeats` times: a likely N+1 pattern."""
+		counts = Counter(self.statements)
+		return {statement: n for statement, n in counts.items() if n >= min_repeats}
+
+
+_query_logs: list[QueryLog] = []
+_query_logs_lock = threading.Lock()
+
+
+@contextmanager
+def capture_queries() -> Iterator[QueryLog]:
+	"""Record every statement run on any engine until the block exits.
+
+	Process-wide rather than per request, so it also sees the queries of a
+	TestClient call, which runs the app in another thread.
+	"""
+	log = QueryLog()
+	with _query_logs_lock:
+		_query_logs.append(log)
+	try:
+		yield log
+	finally:
+		with _query_logs_lock:
+			_query_logs.remove(log)
+
+
+_EXPLAIN_PREFIXES = {"sqlite": "EXPLAIN QUERY PLAN", "postgresql": "EXPLAIN", "mysql": "EXPLAIN"}
+
+
+def _explain(conn: Connection, statement: str, parameters) -> str:
+	prefix = _EXPLAIN_PREFIXES.get(conn.dialect.name)
+	if prefix is None or not statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "WITH")):
+		return ""
+	# A raw DBAPI cursor, so the EXPLAIN itself is not seen by these listeners
+	cursor = conn.connection.dbapi_connection.cursor()
+	try:
+		cursor.execute(f"{prefix} {statement}", parameters)
+		return "\n".join(" ".join(str(col) for col in row) for row in cursor.fetchall())
+	except Exception as e:  # never let diagnostics break the request
+		return f"EXPLAIN failed: {e}"
+	finally:
+		cursor.close()
+
+
+def _log_slow_query(conn: Connection, statement: str, parameters, executemany: bool, seconds: float) -> None:
+	settings = get_settings()
+	if settings.SLOW_QUERY_MS is None or seconds * 1000 < settings.SLOW_QUERY_MS:
+		return
+	plan = ""
+	if settings.SLOW_QUERY_EXPLAIN and not executemany:
+		plan = _explain(conn, statement, parameters)
+	slow_query_logger.warning(
+		"Slow query (%.1f ms): %s\nParameters: %r%s",
+		seconds * 1000,
+		statement,
+		parameters,
+		f"\nPlan:\n{plan}" if plan else "",
+	)
+
+
+# Plan lines meaning a whole table is read. On SQLite, FTS5 lookups and IN
+# lists also show as SCAN (of the virtual table, of CONSTANT ROWS) but are not.
+_FULL_SCAN_PATTERNS = {
+	"sqlite": re.compile(r"^SCAN (?!.*(VIRTUAL TABLE|CONSTANT ROW))"),
+	"postgresql": re.compile(r"Seq Scan on"),
+}
+
+
+def explain_statement(conn: Connection, stmt) -> list[dict]:
+	"""Run the dialect's EXPLAIN for a SQLAlchemy statement; one dict per plan row."""
+	prefix = _EXPLAIN_PREFIXES.get(conn.dialect.name)
+	if prefix is None:
+		raise ValueError(f"EXPLAIN is not supported on {conn.dialect.name}")
+	compiled = stmt.compile(dialect=conn.dialect, compile_kwargs={"render_postcompile": True})
+	params = compiled.params
+	if compiled.positional:
+		params = tuple(params[name] for name in compiled.positiontup)
+	return [dict(row) for row in conn.exec_driver_sql(f"{prefix} {compiled}", params).mappings()]
+
+
+def full_scans(conn: Connection, stmt) -> list[str]:
+	"""Plan rows where `stmt` reads a whole table instead of using an index."""
+	rows = explain_statement(conn, stmt)
+	dialect = conn.dialect.name
+	if dialect == "mysql":
+		return [f"{row['table']}: type=ALL" for row in rows if row.get("type") == "ALL"]
+	column = "detail" if dialect == "sqlite" else "QUERY PLAN"
+	pattern = _FULL_SCAN_PATTERNS[dialect]
+	return [str(row[column]) for row in rows if pattern.search(str(row[column]))]
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+	conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+	seconds = time.perf_counter() - conn.info["query_started"].pop()
+	record_query(seconds)
+	if _query_logs:
+		with _query_logs_lock:
+			for log in _query_logs:
+				log.statements.append(statement)
+	_log_slow_query(conn, statement, parameters, executemany, seconds)
+
+
+def _handle_error(exception_context):
+	# A failed statement never reaches after_cursor_execute
+	conn = exception_context.connection
+	if conn is not None and conn.info.get("query_started"):
+		conn.info["query_started"].pop()
+
+
+def _instrument(engine: Engine) -> None:
+	"""Count and time statements for app/metrics.py, capture_queries() and the slow-query log."""
+	event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+	event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+	event.listen(engine, "handle_error", _handle_error)
+
+
 def _create_engine():
 	settings = get_settings()
 	connect_args = {}
 	# SQLite needs check_same_thread disabled in many local cases
-	if settings.DATABASE_URL.startswith("sqlite"):
+	if _is_sqlite(settings.DATABASE_URL):
 		connect_args = {"check_same_thread": False}
-	return create_engine(settings.DATABASE_URL, echo=False, connect_args=connect_args)
+	engine = create_engine(
+		settings.DATABASE_URL,
+		echo=False,
+		connect_args=connect_args,
+		**_pool_options(settings.DATABASE_URL),
+	)
+	if _is_sqlite(settings.DATABASE_URL):
+		event.listen(engine, "connect", _set_sqlite_pragmas)
+	_instrument(engine)
+	return engine
+
+
+# Built on first use so importing the app, the scraper or the tests does not
+# connect anywhere, and settings overrides made before then are honoured.
+_engine: Engine | None = None
+_sessionmaker: sessionmaker[Session] | None = None
+
+
+def get_engine() -> Engine:
+	global _engine, _sessionmaker
+	if _engine is None:
+		_engine = _create_engine()
+		_sessionmaker = sessionmaker(bind=_engine, autoflush=False, autocommit=False)
+	return _engine
+
 
+def SessionLocal() -> Session:
+	get_engine()
+	assert _sessionmaker is not None
+	return _sessionmaker()
 
-engine = _create_engine()
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+def reset_engine() -> None:
+	"""Dispose the engines so the next use rebuilds them from current settings."""
+	global _engine, _sessionmaker, _async_engine, _async_sessionmaker
+	if _engine is not None:
+		_engine.dispose()
+	_engine = _sessionmaker = None
+	# AsyncEngine.dispose() must be awaited; callers owning a loop should do that first
+	_async_engine = _async_sessionmaker = None
+
+
+def __getattr__(name: str):
+	# Keeps `from app.db import engine` working while staying lazy
+	if name == "engine":
+		return get_engine()
+	raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_session():
@@ -31,13 +281,376 @@ def get_session():
 		session.close()
 
 
+def async_database_url(url: str) -> str:
+	"""Swap the sync driver in `url` for its async counterpart."""
+	parsed = make_url(url)
+	backend = parsed.get_backend_name()
+	if backend not in ASYNC_DRIVERS:
+		raise ValueError(f"No async driver configured for {backend}")
+	return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+_async_engine: AsyncEngine | None = None
+_async_sessionmaker: async_sessionmaker[AsyncSession] | None = None
+
+
+def get_async_engine() -> AsyncEngine:
+	"""Create the AsyncEngine on first use so the async driver stays optional."""
+	global _async_engine, _async_sessionmaker
+	if _async_engine is None:
+		settings = get_settings()
+		url = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+		_async_engine = create_async_engine(url, echo=False, **_pool_options(url))
+		if _is_sqlite(url):
+			event.listen(_async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+		_instrument(_async_engine.sync_engine)
+		# No expiry on commit: async sessions must not lazy-load attributes afterwards
+		_async_sessionmaker = async_sessionmaker(
+			bind=_async_engine, autoflush=False, expire_on_commit=False
+		)
+	return _async_engine
+
+
+def AsyncSessionLocal() -> AsyncSession:
+	get_async_engine()
+	assert _async_sessionmaker is not None
+	return _async_sessionmaker()
+
+
+async def get_async_session():
+	"""FastAPI dependency to provide an async DB session."""
+	async with AsyncSessionLocal() as session:
+		yield session
+
+
+# Schema management
+
+# Kept outside Base.metadata so a reset never drops it
+schema_meta = Table(
+	"schema_meta",
+	MetaData(),
+	Column("id", Integer, primary_key=True),
+	Column("fingerprint", String(64), nullable=False),
+	Column("updated_at", DateTime, nullable=False),
+)
+_SCHEMA_LOCK_NAME = "sms_schema"
+_SCHEMA_LOCK_KEY = 727_100_001  # arbitrary pg_advisory_lock key
+
+
+def schema_fingerprint(dialect) -> str:
+	"""Hash of the DDL `Base.metadata` compiles to on `dialect`."""
+	from . import models  # ensure models are imported and mapped
+	from .search import search_ddl
+
+	ddl = []
+	for table in Base.metadata.sorted_tables:
+		ddl.append(str(CreateTable(table).compile(dialect=dialect)))
+		ddl.extend(
+			str(CreateIndex(index).compile(dialect=dialect))
+			for index in sorted(table.indexes, key=lambda i: i.name or "")
+		)
+	ddl.extend(search_ddl(dialect.name))
+	return hashlib.sha256("\n".join(ddl).encode("utf-8")).hexdigest()
+
+
+def _stored_fingerprint(conn: Connection) -> str | None:
+	# Checked rather than caught: rolling back would drop the schema lock
+	if not inspect(conn).has_table(schema_meta.name):
+		return None
+	return conn.execute(select(schema_meta.c.fingerprint).where(schema_meta.c.id == 1)).scalar()
+
+
+def _store_fingerprint(conn: Connection, fingerprint: str) -> None:
+	schema_meta.create(conn, checkfirst=True)
+	conn.execute(schema_meta.delete())
+	conn.execute(schema_meta.insert().values(id=1, fingerprint=fingerprint, updated_at=datetime.utcnow()))
+
+
+class SchemaDriftError(RuntimeError):
+	"""The database schema differs from the models in a way startup cannot repair."""
+
+	def __init__(self, missing: list[str]):
+		self.missing = missing
+		super().__init__(
+			"Database schema is out of date and cannot be upgraded in place (missing: "
+			+ ", ".join(missing)
+			+ "). Run `python -m app.db init --reset` to recreate it (this destroys data)."
+		)
+
+
+# ON DELETE behaviours that leave children alone; backends report these differently
+_NO_DELETE_ACTION = {None, "NO ACTION", "RESTRICT"}
+
+
+def _foreign_key_signature(referred_table: str, columns, ondelete: str | None) -> tuple:
+	ondelete = ondelete.upper() if ondelete else None
+	return referred_table, tuple(columns), None if ondelete in _NO_DELETE_ACTION else ondelete
+
+
+def _stale_foreign_keys(conn: Connection, table: Table) -> list[ForeignKeyConstraint]:
+	"""Foreign keys of `table` missing from the database or with a different ON DELETE."""
+	live = {
+		_foreign_key_signature(fk["referred_table"], fk["constrained_columns"], fk.get("options", {}).get("ondelete"))
+		for fk in inspect(conn).get_foreign_keys(table.name)
+	}
+	return [
+		fk
+		for fk in table.foreign_key_constraints
+		if _foreign_key_signature(fk.referred_table.name, fk.column_keys, fk.ondelete) not in live
+	]
+
+
+def schema_drift(conn: Connection) -> list[str]:
+	"""Tables, columns, indexes and constraints of the models missing from the database."""
+	from . import models  # ensure models are imported and mapped
+
+	inspector = inspect(conn)
+	live_tables = set(inspector.get_table_names())
+	missing = []
+	for table in Base.metadata.sorted_tables:
+		if table.name not in live_tables:
+			missing.append(f"table {table.name}")
+			continue
+		columns = {c["name"] for c in inspector.get_columns(table.name)}
+		missing.extend(f"column {table.name}.{c.name}" for c in table.columns if c.name not in columns)
+		indexes = inspector.get_indexes(table.name)
+		index_names = {i["name"] for i in indexes}
+		missing.extend(f"index {i.name}" for i in table.indexes if i.name not in index_names)
+		unique = {tuple(u["column_names"]) for u in inspector.get_unique_constraints(table.name)}
+		unique.update(tuple(i["column_names"]) for i in indexes if i["unique"])
+		missing.extend(
+			f"unique constraint {c.name}"
+			for c in table.constraints
+			if isinstance(c, UniqueConstraint) and tuple(c.columns.keys()) not in unique
+		)
+		missing.extend(
+			f"foreign key {table.name}({', '.join(fk.column_keys)}) -> {fk.referred_table.name} "
+			f"ON DELETE {fk.ondelete or 'NO ACTION'}"
+			for fk in _stale_foreign_keys(conn, table)
+		)
+	return missing
+
+
+def _backfill_prices(conn: Connection) -> None:
+	from .models import ScrapedResource
+	from .schemas import parse_price
+
+	resources = ScrapedResource.__table__
+	params = []
+	for row_id, price in conn.execute(select(resources.c.id, resources.c.price).where(resources.c.price.is_not(None))):
+		_, amount, currency = parse_price(price)
+		params.append({"row_id": row_id, "amount": amount, "code": currency})
+	if params:
+		conn.execute(
+			update(resources)
+			.where(resources.c.id == bindparam("row_id"))
+			.values(price_amount=bindparam("amount"), currency=bindparam("code")),
+			params,
+		)
+
+
+def _backfill_enrolled_counts(conn: Connection) -> None:
+	# Seats already taken; left at the default 0, the guarded UPDATE would overfill courses
+	conn.exec_driver_sql(
+		"UPDATE courses SET enrolled_count = "
+		"(SELECT COUNT(*) FROM enrollments WHERE enrollments.course_id = courses.id)"
+	)
+
+
+# Fill columns added to existing tables from the data already there, keyed by (table, column)
+_BACKFILLS = {
+	("courses", "enrolled_count"): _backfill_enrolled_counts,
+	("scraped_resources", "price_amount"): _backfill_prices,
+	("scraped_resources", "currency"): _backfill_prices,
+}
+
+
+def _replace_foreign_keys(conn: Connection, table: Table, stale: list[ForeignKeyConstraint]) -> None:
+	"""Give `table` the foreign keys of the models, keeping its rows."""
+	preparer = conn.dialect.identifier_preparer
+	name = preparer.format_table(table)
+	if conn.dialect.name != "sqlite":
+		drop = "DROP FOREIGN KEY" if conn.dialect.name == "mysql" else "DROP CONSTRAINT"
+		stale_columns = {tuple(fk.column_keys) for fk in stale}
+		for fk in inspect(conn).get_foreign_keys(table.name):
+			if tuple(fk["constrained_columns"]) in stale_columns and fk["name"]:
+				conn.exec_driver_sql(f"ALTER TABLE {name} {drop} {preparer.quote(fk['name'])}")
+		for fk in stale:
+			conn.execute(AddConstraint(fk))
+		return
+	# SQLite cannot alter constraints: copy the rows into a table built from the
+	# models and swap it in. Needs foreign_keys=OFF, which _schema_lock sets.
+	live = {c["name"] for c in inspect(conn).get_columns(table.name)}
+	if any(c.name not in live for c in table.columns):
+		return  # a column could not be added; schema_drift reports it
+	rebuilt = preparer.quote(f"_rebuild_{table.name}")
+	ddl = str(CreateTable(table).compile(dialect=conn.dialect))
+	columns = ", ".join(preparer.quote(c.name) for c in table.columns)
+	conn.exec_driver_sql(ddl.replace(f"CREATE TABLE {name} ", f"CREATE TABLE {rebuilt} ", 1))
+	conn.exec_driver_sql(f"INSERT INTO {rebuilt} ({columns}) SELECT {columns} FROM {name}")
+	conn.exec_driver_sql(f"DROP TABLE {name}")
+	conn.exec_driver_sql(f"ALTER TABLE {rebuilt} RENAME TO {name}")
+	orphans = conn.exec_driver_sql(f"PRAGMA foreign_key_check({name})").all()
+	if orphans:
+		logger.warning("%s has %d rows referencing missing parent rows", table.name, len(orphans))
+
+
+def _upgrade_tables(conn: Connection) -> None:
+	"""Add the columns and constraints existing tables lack, then backfill them.
+
+	Columns that are NOT NULL without a server default cannot be added to a
+	populated table and are left for `schema_drift` to report. Tables whose
+	foreign keys differ from the models (e.g. no ON DELETE CASCADE) get them
+	replaced; their indexes are recreated afterwards by `_create_missing_indexes`.
+	"""
+	inspector = inspect(conn)
+	preparer = conn.dialect.identifier_preparer
+	backfills = []
+	for table in Base.metadata.sorted_tables:
+		columns = {c["name"] for c in inspector.get_columns(table.name)}
+		for column in table.columns:
+			if column.name in columns or (not column.nullable and column.server_default is None):
+				continue
+			ddl = CreateColumn(column).compile(dialect=conn.dialect)
+			conn.exec_driver_sql(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {ddl}")
+			backfill = _BACKFILLS.get((table.name, column.name))
+			if backfill is not None and backfill not in backfills:
+				backfills.append(backfill)
+		indexes = inspector.get_indexes(table.name)
+		unique = {tuple(u["column_names"]) for u in inspector.get_unique_constraints(table.name)}
+		unique.update(tuple(i["column_names"]) for i in indexes if i["unique"])
+		for constraint in table.constraints:
+			if not isinstance(constraint, UniqueConstraint) or tuple(constraint.columns.keys()) in unique:
+				continue
+			# A unique index enforces the same rule and, unlike ADD CONSTRAINT, works on SQLite
+			names = ", ".join(preparer.quote(name) for name in constraint.columns.keys())
+			try:
+				conn.exec_driver_sql(
+					f"CREATE UNIQUE INDEX {preparer.quote(constraint.name)} "
+					f"ON {preparer.format_table(table)} ({names})"
+				)
+			except IntegrityError:
+				raise SchemaDriftError([f"unique constraint {constraint.name} (table has duplicate rows)"])
+		stale = _stale_foreign_keys(conn, table)
+		if stale:
+			_replace_foreign_keys(conn, table, stale)
+	for backfill in backfills:
+		backfill(conn)
+
+
+def _create_missing_indexes(conn: Connection) -> None:
+	inspector = inspect(conn)
+	for table in Base.metadata.sorted_tables:
+		columns = {c["name"] for c in inspector.get_columns(table.name)}
+		for index in table.indexes:
+			missing = [f"column {table.name}.{c.name}" for c in index.columns if c.name not in columns]
+			if missing:
+				# Would otherwise fail with a bare "no such column" from the database
+				raise SchemaDriftError(missing)
+			index.create(conn, checkfirst=True)
+
+
+@contextmanager
+def _schema_lock(bind: Engine):
+	"""Connection holding a cross-process lock so one worker migrates at a time."""
+	with bind.connect() as conn:
+		dialect = bind.dialect.name
+		if dialect == "postgresql":
+			conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _SCHEMA_LOCK_KEY})
+		elif dialect == "mysql":
+			conn.execute(text("SELECT GET_LOCK(:name, 60)"), {"name": _SCHEMA_LOCK_NAME})
+		elif dialect == "sqlite":
+			# Rebuilding a table drops the old one, which must not cascade to its
+			# children; the pragma only takes effect outside a transaction.
+			conn.exec_driver_sql("PRAGMA foreign_keys=OFF")
+			# Takes the database write lock up front; other workers wait on busy_timeout
+			conn.exec_driver_sql("BEGIN IMMEDIATE")
+		try:
+			yield conn
+			conn.commit()
+		finally:
+			if dialect == "mysql":
+				conn.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": _SCHEMA_LOCK_NAME})
+			elif dialect == "sqlite":
+				# End a failed transaction first so the pooled connection gets its pragma back
+				conn.rollback()
+				conn.exec_driver_sql("PRAGMA foreign_keys=ON")
+
+
+def ensure_schema(bind: Engine | None = None) -> bool:
+	"""Bring the database up to the models without touching existing data.
+
+	The common case (stored fingerprint matches the models) costs one SELECT.
+	Otherwise a database-level lock serialises concurrent workers and only the
+	first one creates missing tables, adds and backfills missing columns and
+	creates missing indexes. The fingerprint is stored only once the live
+	schema matches; anything that cannot be repaired in place raises
+	`SchemaDriftError`. Returns True if the schema was updated.
+	"""
+	from .search import ensure_search_index
+
+	bind = bind or get_engine()
+	fingerprint = schema_fingerprint(bind.dialect)
+	with bind.connect() as conn:
+		if _stored_fingerprint(conn) == fingerprint:
+			return False
+	with _schema_lock(bind) as conn:
+		if _stored_fingerprint(conn) == fingerprint:
+			return False  # another worker got there first
+		Base.metadata.create_all(conn, checkfirst=True)
+		# create_all skips existing tables entirely, including columns and indexes added since
+		_upgrade_tables(conn)
+		_create_missing_indexes(conn)
+		ensure_search_index(conn)
+		missing = schema_drift(conn)
+		if missing:
+			raise SchemaDriftError(missing)
+		_store_fingerprint(conn, fingerprint)
+	logger.warning("Schema fingerprint changed: created missing tables, columns and indexes.")
+	return True
+
+
 def init_db():
+	"""Destructive reset: drop and recreate every table."""
 	from . import models  # ensure models are imported and mapped
+	from .cache import get_entity_cache
+	from .search import drop_search_index, ensure_search_index
+
+	get_entity_cache().clear()
 	# Ensure a clean schema for tests and local runs
+	engine = get_engine()
+	with engine.begin() as conn:
+		drop_search_index(conn)
 	Base.metadata.drop_all(bind=engine)
 	Base.metadata.create_all(bind=engine)
+	with engine.begin() as conn:
+		ensure_search_index(conn)
+		_store_fingerprint(conn, schema_fingerprint(engine.dialect))
+
+
+def main(argv: list[str] | None = None) -> int:
+	parser = argparse.ArgumentParser(prog="python -m app.db", description="Database management")
+	commands = parser.add_subparsers(dest="command", required=True)
+	init = commands.add_parser("init", help="Add missing tables, columns and indexes")
+	init.add_argument("--reset", action="store_true", help="Drop and recreate all tables (destroys data)")
+	args = parser.parse_args(argv)
+
+	if args.reset:
+		init_db()
+		print("Database reset.")
+		return 0
+	try:
+		updated = ensure_schema()
+	except SchemaDriftError as e:
+		print(e, file=sys.stderr)
+		return 1
+	print("Database schema updated." if updated else "Database schema up to date.")
+	return 0
 
 
 if __name__ == "__main__":
-	init_db()
-	print("Database initialized.")
\ No newline at end of file
+	# Run through the package module: under `python -m` this file is `__main__`,
+	# whose Base is not the one the models are registered on.
+	from app.db import main as _main
+
+	raise SystemExit(_main())
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import csv
+import io
+from datetime import datetime
+from typing import Iterator, NamedTuple
+
+from pydantic_core import to_json
+from sqlalchemy import select
+
+from . import models, schemas
+from .db import SessionLocal
+
+# Rows fetched per round trip while streaming an export
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_FORMATS = {
+	"csv": "text/csv",
+	"ndjson": "application/x-ndjson",
+}
+
+
+class ExportSpec(NamedTuple):
+	model: type
+	schema: type
+	# Query parameters accepted as equality filters for this entity
+	filters: tuple[str, ...] = ()
+
+
+EXPORTS: dict[str, ExportSpec] = {
+	"students": ExportSpec(models.Student, schemas.StudentRead),
+	"teachers": ExportSpec(models.Teacher, schemas.TeacherRead),
+	"courses": ExportSpec(models.Course, schemas.CourseRead, ("teacher_id",)),
+	"enrollments": ExportSpec(models.Enrollment, schemas.EnrollmentRead, ("student_id", "course_id")),
+	"scraped": ExportSpec(
+		models.ScrapedResource, schemas.ScrapedResourceRead, ("source", "category_or_author")
+	),
+}
+
+
+def export_statement(entity: str, columns: list[str] | None = None, filters: dict | None = None):
+	"""SELECT for an export, ordered by id.
+
+	`columns` defaults to the fields of the entity's Read schema; `filters` maps
+	column names to required values. Unknown names raise ValueError.
+	"""
+	spec = EXPORTS.get(entity)
+	if spec is None:
+		raise LookupError(f"Unknown export '{entity}'")
+	allowed = list(spec.schema.model_fields)
+	columns = columns or allowed
+	unknown = [name for name in columns if name not in allowed]
+	if unknown:
+		raise ValueError(f"Unknown column(s) {', '.join(unknown)}; choose from {', '.join(allowed)}")
+	stmt = select(*(getattr(spec.model, name) for name in columns)).order_by(spec.model.id)
+	for name, value in (filters or {}).items():
+		if name not in spec.filters:
+			raise ValueError(f"'{entity}' cannot be filtered by {name}")
+		stmt = stmt.where(getattr(spec.model, name) == value)
+	return stmt
+
+
+def _csv_value(value):
+	return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _iter_partitions(stmt, batch_size: int):
+	# Own session: the request's session is closed before a StreamingResponse
+	# starts iterating. yield_per turns on server-side cursors where supported.
+	with SessionLocal() as db:
+		result = db.execute(stmt.execution_options(yield_per=batch_size))
+		yield result.keys()
+		yield from result.partitions()
+
+
+def iter_csv(stmt, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[str]:
+	"""Stream `stmt` as CSV with a header row, one chunk per fetched batch."""
+	buffer = io.StringIO()
+	writer = csv.writer(buffer)
+	partitions = _iter_partitions(stmt, batch_size)
+	writer.writerow(next(partitions))
+	for rows in partitions:
+		writer.writerows([_csv_value(value) for value in row] for row in rows)
+		yield buffer.getvalue()
+		buffer.seek(0)
+		buffer.truncate()
+	if buffer.tell():
+		yield buffer.getvalue()
+
+
+def iter_ndjson(stmt, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[bytes]:
+	"""Stream `stmt` as one JSON object per line, encoded like the list endpoints."""
+	partitions = _iter_partitions(stmt, batch_size)
+	keys = list(next(partitions))
+	for rows in partitions:
+		yield b"".join(to_json(dict(zip(keys, row))) + b"\n" for row in rows)
+
+
+def iter_export(stmt, fmt: str, batch_size: int | None = None):
+	batch_size = batch_size or EXPORT_BATCH_SIZE
+	return iter_csv(stmt, batch_size) if fmt == "csv" else iter_ndjson(stmt, batch_size)
@@ -1,13 +1,32 @@
 from __future__ import annotations
 
-from fastapi import FastAPI, Depends, HTTPException
-from fastapi.responses import RedirectResponse
+import time
+from decimal import Decimal
+from typing import AsyncIterator
+
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, RedirectResponse, StreamingResponse
+from fastapi.routing import APIRoute
+from pydantic import TypeAdapter, ValidationError
+from pydantic_core import to_json
 from sqlalchemy.orm import Session
 
-from .db import get_session, init_db
-from . import crud, schemas
+from .cache import get_entity_cache
+from .config import get_settings
+from .db import ensure_schema, get_session
+from . import crud, models, schemas, search
+from .export import EXPORT_FORMATS, export_statement, iter_export
+from .metrics import PROMETHEUS_CONTENT_TYPE, MetricsMiddleware, metrics
+from .pagination import after_id, rows_response, with_next_cursor
 
 app = FastAPI(title="School Management System (SMS)")
+app.add_middleware(MetricsMiddleware)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+IMPORT_CHUNK_SIZE = 1000
+
+
 # Root
 @app.get("/")
 def root():
@@ -16,7 +35,7 @@ def root():
 
 @app.on_event("startup")
 def _startup():
-	init_db()
+	ensure_schema()
 
 
 # Students
@@ -26,8 +45,14 @@ def create_student(student: schemas.StudentCreate, db: Session = Depends(get_ses
 
 
 @app.get("/students", response_model=list[schemas.StudentRead])
-def list_students(skip: int = 0, limit: int = 100, db: Session = Depends(get_session)):
-	return crud.list_students(db, skip, limit)
+def list_students(
+	skip: int = 0,
+	limit: int = 100,
+	after: str | None = None,
+	db: Session = Depends(get_session),
+):
+	rows = crud.list_rows(db, models.Student, schemas.StudentRead, skip, limit, after_id(after))
+	return rows_response(rows, limit)
 
 
 @app.get("/students/{student_id}", response_model=schemas.StudentRead)
@@ -53,8 +78,14 @@ def create_teacher(teacher: schemas.TeacherCreate, db: Session = Depends(get_ses
 
 
 @app.get("/teachers", response_model=list[schemas.TeacherRead])
-def list_teachers(skip: int = 0, limit: int = 100, db: Session = Depends(get_session)):
-	return crud.list_teachers(db, skip, limit)
+def list_teachers(
+	skip: int = 0,
+	limit: int = 100,
+	after: str | None = None,
+	db: Session = Depends(get_session),
+):
+	rows = crud.list_rows(db, models.Teacher, schemas.TeacherRead, skip, limit, after_id(after))
+	return rows_response(rows, limit)
 
 
 @app.get("/teachers/{teacher_id}", response_model=schemas.TeacherRead)
@@ -76,12 +107,33 @@ def delete_teacher(teacher_id: int, db: Session = Depends(get_session)):
 # Courses
 @app.post("/courses", response_model=schemas.CourseRead)
 def create_course(course: schemas.CourseCreate, db: Session = Depends(get_session)):
-	return crud.create_course(db, course)
+	try:
+		return crud.create_course(db, course)
+	except ValueError as e:
+		raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.get("/courses", response_model=list[schemas.CourseRead])
-def list_courses(skip: int = 0, limit: int = 100, db: Session = Depends(get_session)):
-	return crud.list_courses(db, skip, limit)
+def list_courses(
+	skip: int = 0,
+	limit: int = 100,
+	after: str | None = None,
+	db: Session = Depends(get_session),
+):
+	rows = crud.list_rows(db, models.Course, schemas.CourseRead, skip, limit, after_id(after))
+	return rows_response(rows, limit)
+
+
+@app.get("/courses/overview", response_model=list[schemas.CourseOverview])
+def course_overview(
+	response: Response,
+	skip: int = 0,
+	limit: int = 100,
+	after: str | None = None,
+	db: Session = Depends(get_session),
+):
+	rows = crud.list_course_overview(db, skip, limit, after_id(after))
+	return with_next_cursor(response, rows, limit)
 
 
 @app.get("/courses/{course_id}", response_model=schemas.CourseRead)
@@ -109,9 +161,31 @@ def create_enrollment(enrollment: schemas.EnrollmentCreate, db: Session = Depend
 		raise HTTPException(status_code=400, detail=str(e))
 
 
+@app.post("/enrollments/bulk", response_model=schemas.EnrollmentBulkResult)
+def create_enrollments_bulk(items: list[schemas.EnrollmentCreate], db: Session = Depends(get_session)):
+	try:
+		return crud.create_enrollments_bulk(db, items)
+	except ValueError as e:
+		raise HTTPException(status_code=400, detail=str(e))
+
+
 @app.get("/enrollments", response_model=list[schemas.EnrollmentRead])
-def list_enrollments(skip: int = 0, limit: int = 100, db: Session = Depends(get_session)):
-	return crud.list_enrollments(db, skip, limit)
+def list_enrollments(
+	skip: int = 0,
+	limit: int = 100,
+	after: str | None = None,
+	db: Session = Depends(get_session),
+):
+	rows = crud.list_rows(db, models.Enrollment, schemas.EnrollmentRead, skip, limit, after_id(after))
+	return rows_response(rows, limit)
+
+
+@app.delete("/enrollments")
+def delete_course_enrollments(course_id: int, db: Session = Depends(get_session)):
+	deleted = crud.delete_course_enrollments(db, course_id)
+	if deleted is None:
+		raise HTTPException(status_code=404, detail="Course not found")
+	return {"deleted": deleted}
 
 
 @app.delete("/enrollments/{enrollment_id}")
@@ -122,8 +196,300 @@ def delete_enrollment(enrollment_id: int, db: Session = Depends(get_session)):
 	return {"deleted": True}
 
 
+# Entity cache
+@app.get("/cache/stats")
+def cache_stats():
+	return get_entity_cache().stats()
+
+
+# Metrics
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics_endpoint():
+	return PlainTextResponse(metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+# Streaming exports
+@app.get("/export/{entity}", response_class=StreamingResponse)
+def export_entity(
+	entity: str,
+	format: str = Query("csv", pattern="^(csv|ndjson)$"),
+	columns: str | None = Query(None, description="Comma-separated subset of columns"),
+	student_id: int | None = None,
+	course_id: int | None = None,
+	teacher_id: int | None = None,
+	source: str | None = None,
+	category_or_author: str | None = None,
+):
+	"""Stream a whole table as CSV or NDJSON.
+
+	Rows are fetched in batches from a server-side cursor and written as they
+	arrive, so memory use does not grow with the table.
+	"""
+	filters = {
+		name: value
+		for name, value in (
+			("student_id", student_id),
+			("course_id", course_id),
+			("teacher_id", teacher_id),
+			("source", source),
+			("category_or_author", category_or_author),
+		)
+		if value is not None
+	}
+	selected = [name.strip() for name in columns.split(",") if name.strip()] if columns else None
+	try:
+		stmt = export_statement(entity, selected, filters)
+	except LookupError as e:
+		raise HTTPException(status_code=404, detail=str(e))
+	except ValueError as e:
+		raise HTTPException(status_code=400, detail=str(e))
+	return StreamingResponse(
+		iter_export(stmt, format),
+		media_type=EXPORT_FORMATS[format],
+		headers={"Content-Disposition": f'attachment; filename="{entity}.{format}"'},
+	)
+
+
 # Scraped resources import
-@app.post("/scraped/import")
-def import_scraped(items: list[schemas.ScrapedResourceCreate], db: Session = Depends(get_session)):
-	inserted = crud.insert_scraped_resources(db, items)
-	return {"inserted": inserted}
\ No newline at end of file
+_scraped_list_adapter = TypeAdapter(list[schemas.ScrapedResourceCreate])
+
+
+async def _iter_ndjson_lines(request: Request) -> AsyncIterator[tuple[int, bytes]]:
+	"""Yield (line number, line) for each non-blank line of a streamed body."""
+	buffer = b""
+	line_no = 0
+	async for chunk in request.stream():
+		buffer += chunk
+		*lines, buffer = buffer.split(b"\n")
+		for line in lines:
+			line_no += 1
+			if line.strip():
+				yield line_no, line
+	if buffer.strip():
+		yield line_no + 1, buffer
+
+
+def _is_ndjson(request: Request) -> bool:
+	return request.headers.get("content-type", "").split(";")[0].strip() == NDJSON_MEDIA_TYPE
+
+
+def _ndjson_line_error(line_no: int, e: ValidationError, **detail) -> HTTPException:
+	return HTTPException(
+		status_code=422,
+		detail={"line": line_no, "errors": e.errors(include_url=False, include_context=False), **detail},
+	)
+
+
+@app.post(
+	"/scraped/import",
+	response_model=schemas.ScrapedImportReport,
+	openapi_extra={
+		"requestBody": {
+			"required": True,
+			"content": {
+				"application/json": {"schema": _scraped_list_adapter.json_schema()},
+				NDJSON_MEDIA_TYPE: {"schema": schemas.ScrapedResourceCreate.model_json_schema()},
+			},
+		}
+	},
+)
+async def import_scraped(
+	request: Request,
+	chunk_size: int = Query(IMPORT_CHUNK_SIZE, ge=1, le=10_000),
+	db: Session = Depends(get_session),
+):
+	"""Upsert scraped items from a JSON array or a streamed NDJSON body.
+
+	Items are validated and written in chunks of `chunk_size`, each committed
+	on its own, so an NDJSON import never holds more than one chunk in memory.
+	"""
+	started = time.perf_counter()
+	report = schemas.ScrapedImportReport()
+
+	async def flush(chunk: list[schemas.ScrapedResourceCreate]) -> None:
+		result = await run_in_threadpool(crud.insert_scraped_resources, db, chunk)
+		report.inserted += result.inserted
+		report.updated += result.updated
+		report.unchanged += result.unchanged
+		report.rows += len(chunk)
+
+	if _is_ndjson(request):
+		chunk: list[schemas.ScrapedResourceCreate] = []
+		async for line_no, line in _iter_ndjson_lines(request):
+			try:
+				chunk.append(schemas.ScrapedResourceCreate.model_validate_json(line))
+			except ValidationError as e:
+				raise _ndjson_line_error(line_no, e, committed_rows=report.rows)
+			if len(chunk) >= chunk_size:
+				await flush(chunk)
+				chunk = []
+		if chunk:
+			await flush(chunk)
+	else:
+		try:
+			items = _scraped_list_adapter.validate_json(await request.body())
+		except ValidationError as e:
+			raise HTTPException(status_code=422, detail=e.errors(include_url=False, include_context=False))
+		for start in range(0, len(items), chunk_size):
+			await flush(items[start:start + chunk_size])
+
+	report.elapsed_seconds = round(time.perf_counter() - started, 6)
+	if report.elapsed_seconds > 0:
+		report.rows_per_second = round(report.rows / report.elapsed_seconds, 1)
+	return report
+
+
+# Bulk student/teacher import
+def _bulk_request_body(item_schema) -> dict:
+	return {
+		"requestBody": {
+			"required": True,
+			"content": {
+				"application/json": {"schema": TypeAdapter(list[item_schema]).json_schema()},
+				NDJSON_MEDIA_TYPE: {"schema": item_schema.model_json_schema()},
+			},
+		}
+	}
+
+
+async def _create_people_bulk(request: Request, item_schema, create, chunk_size: int, db: Session) -> Response:
+	"""Insert every person in the body in one transaction and echo the new rows.
+
+	Rows are inserted `chunk_size` at a time but committed only at the end, so
+	a bad line anywhere leaves nothing behind. SQLite has a single writer and
+	the first INSERT takes its write lock, so there the whole body is validated
+	before anything is inserted rather than holding the lock for the upload.
+	"""
+	insert_while_streaming = db.get_bind().dialect.name != "sqlite"
+	created: list[dict] = []
+
+	async def flush(items: list) -> None:
+		created.extend(await run_in_threadpool(create, db, items, False))
+
+	try:
+		if _is_ndjson(request):
+			pending = []
+			async for line_no, line in _iter_ndjson_lines(request):
+				try:
+					pending.append(item_schema.model_validate_json(line))
+				except ValidationError as e:
+					raise _ndjson_line_error(line_no, e)
+				if insert_while_streaming and len(pending) >= chunk_size:
+					await flush(pending)
+					pending = []
+		else:
+			try:
+				pending = TypeAdapter(list[item_schema]).validate_json(await request.body())
+			except ValidationError as e:
+				raise HTTPException(status_code=422, detail=e.errors(include_url=False, include_context=False))
+		for start in range(0, len(pending), chunk_size):
+			await flush(pending[start:start + chunk_size])
+		await run_in_threadpool(db.commit)
+	except Exception:
+		await run_in_threadpool(db.rollback)
+		raise
+	return Response(to_json(created), media_type="application/json")
+
+
+@app.post(
+	"/students/bulk",
+	response_model=list[schemas.StudentRead],
+	openapi_extra=_bulk_request_body(schemas.StudentCreate),
+)
+async def create_students_bulk(
+	request: Request,
+	chunk_size: int = Query(IMPORT_CHUNK_SIZE, ge=1, le=10_000),
+	db: Session = Depends(get_session),
+):
+	"""Create students from a JSON array or a streamed NDJSON body, all or nothing."""
+	return await _create_people_bulk(request, schemas.StudentCreate, crud.create_students_bulk, chunk_size, db)
+
+
+@app.post(
+	"/teachers/bulk",
+	response_model=list[schemas.TeacherRead],
+	openapi_extra=_bulk_request_body(schemas.TeacherCreate),
+)
+async def create_teachers_bulk(
+	request: Request,
+	chunk_size: int = Query(IMPORT_CHUNK_SIZE, ge=1, le=10_000),
+	db: Session = Depends(get_session),
+):
+	"""Create teachers from a JSON array or a streamed NDJSON body, all or nothing."""
+	return await _create_people_bulk(request, schemas.TeacherCreate, crud.create_teachers_bulk, chunk_size, db)
+
+
+# Scraped resources listing and price stats
+def _minor_units(price: Decimal | None) -> int | None:
+	return None if price is None else int((price * 100).to_integral_value())
+
+
+@app.get("/scraped", response_model=list[schemas.ScrapedResourceRead])
+def list_scraped(
+	skip: int = 0,
+	limit: int = 100,
+	after: str | None = None,
+	source: str | None = None,
+	category_or_author: str | None = None,
+	currency: str | None = None,
+	min_price: Decimal | None = Query(None, ge=0, description="Inclusive, in major units (e.g. 12.50)"),
+	max_price: Decimal | None = Query(None, ge=0, description="Inclusive, in major units"),
+	db: Session = Depends(get_session),
+):
+	rows = crud.list_scraped(
+		db,
+		skip,
+		limit,
+		after_id(after),
+		source=source,
+		category_or_author=category_or_author,
+		currency=currency,
+		min_amount=_minor_units(min_price),
+		max_amount=_minor_units(max_price),
+	)
+	return rows_response(rows, limit)
+
+
+@app.get("/scraped/stats", response_model=list[schemas.ScrapedCategoryStats])
+def scraped_stats(source: str | None = None, db: Session = Depends(get_session)):
+	return crud.scraped_stats(db, source)
+
+
+# Scraped resources search
+@app.get("/scraped/search", response_model=list[schemas.ScrapedSearchHit])
+def search_scraped(
+	q: str = Query(..., min_length=1, max_length=200),
+	source: str | None = None,
+	category_or_author: str | None = None,
+	limit: int = Query(20, ge=1, le=100),
+	offset: int = Query(0, ge=0),
+	db: Session = Depends(get_session),
+):
+	"""Ranked full-text search over titles and categories/authors."""
+	try:
+		return search.search_scraped(
+			db, q, source=source, category_or_author=category_or_author, limit=limit, offset=offset
+		)
+	except ValueError as e:
+		raise HTTPException(status_code=501, detail=str(e))
+
+
+# Async route mode. Keep this block last: it swaps the sync handlers above for
+# the async ones in app/async_api.py when ASYNC_DATABASE is enabled.
+def use_async_routes(application: FastAPI) -> None:
+	from .async_api import router as async_router
+
+	replaced = {(route.path, method) for route in async_router.routes for method in route.methods}
+	application.router.routes = [
+		route
+		for route in application.router.routes
+		if not (
+			isinstance(route, APIRoute)
+			and any((route.path, method) in replaced for method in route.methods)
+		)
+	]
+	application.include_router(async_router)
+
+
+if get_settings().ASYNC_DATABASE:
+	use_async_routes(app)
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Prometheus text exposition format served at /metrics
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Prometheus client defaults, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Label used for requests that match no route, keeping label cardinality bounded
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+@dataclass
+class RequestStats:
+	"""Database work done while serving one request."""
+
+	queries: int = 0
+	db_seconds: float = 0.0
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> RequestStats | None:
+	return _request_stats.get()
+
+
+def record_query(seconds: float) -> None:
+	"""Charge one statement to the request being served, if any.
+
+	Called from the engine's cursor-execute listeners. Sync endpoints run in a
+	worker thread with a copy of the request context, which still references
+	the same RequestStats object.
+	"""
+	stats = _request_stats.get()
+	if stats is not None:
+		stats.queries += 1
+		stats.db_seconds += seconds
+
+
+class _Histogram:
+	def __init__(self, buckets: tuple[float, ...]):
+		self.buckets = buckets
+		self.counts = [0] * (len(buckets) + 1)
+		self.sum = 0.0
+
+	def observe(self, value: float) -> None:
+		self.counts[bisect.bisect_left(self.buckets, value)] += 1
+		self.sum += value
+
+
+class MetricsRegistry:
+	"""Per-route request and database metrics kept in process memory."""
+
+	def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+		self.buckets = buckets
+		self._lock = threading.Lock()
+		self._latency: dict[tuple[str, str], _Histogram] = {}
+		self._in_flight: dict[tuple[str, str], int] = {}
+		self._responses: dict[tuple[str, str, str], int] = {}
+		self._queries: dict[tuple[str, str], int] = {}
+		self._db_seconds: dict[tuple[str, str], float] = {}
+
+	def request_started(self, method: str, route: str) -> None:
+		with self._lock:
+			key = (method, route)
+			self._in_flight[key] = self._in_flight.get(key, 0) + 1
+
+	def request_finished(
+		self, method: str, route: str, status: int, seconds: float, stats: RequestStats
+	) -> None:
+		with self._lock:
+			key = (method, route)
+			self._in_flight[key] -= 1
+			histogram = self._latency.get(key)
+			if histogram is None:
+				histogram = self._latency[key] = _Histogram(self.buckets)
+			histogram.observe(seconds)
+			status_key = (method, route, str(status))
+			self._responses[status_key] = self._responses.get(status_key, 0) + 1
+			self._queries[key] = self._queries.get(key, 0) + stats.queries
+			self._db_seconds[key] = self._db_seconds.get(key, 0.0) + stats.db_seconds
+
+	def reset(self) -> None:
+		with self._lock:
+			self._latency.clear()
+			self._responses.clear()
+			self._queries.clear()
+			self._db_seconds.clear()
+			# Keep in-flight entries: those requests will still finish
+			self._in_flight = {k: v for k, v in self._in_flight.items() if v}
+
+	def render(self) -> str:
+		"""All metrics in Prometheus text format."""
+		lines: list[str] = []
+
+		def family(name: str, kind: str, help_text: str) -> None:
+			lines.append(f"# HELP {name} {help_text}")
+			lines.append(f"# TYPE {name} {kind}")
+
+		with self._lock:
+			family("sms_http_requests_in_flight", "gauge", "Requests currently being served.")
+			for (method, route), value in sorted(self._in_flight.items()):
+				lines.append(f"sms_http_requests_in_flight{_labels(method=method, route=route)} {value}")
+
+			family("sms_http_requests_total", "counter", "Completed requests by status code.")
+			for (method, route, status), value in sorted(self._responses.items()):
+				labels = _labels(method=method, route=route, status=status)
+				lines.append(f"sms_http_requests_total{labels} {value}")
+
+			name = "sms_http_request_duration_seconds"
+			family(name, "histogram", "Request latency until the response body is sent.")
+			for (method, route), histogram in sorted(self._latency.items()):
+				cumulative = 0
+				for bound, count in zip((*histogram.buckets, float("inf")), histogram.counts):
+					cumulative += count
+					le = "+Inf" if bound == float("inf") else repr(bound)
+					labels = _labels(method=method, route=route, le=le)
+					lines.append(f"{name}_bucket{labels} {cumulative}")
+				labels = _labels(method=method, route=route)
+				lines.append(f"{name}_sum{labels} {histogram.sum!r}")
+				lines.append(f"{name}_count{labels} {cumulative}")
+
+			family("sms_db_queries_total", "counter", "SQL statements executed while serving requests.")
+			for (method, route), value in sorted(self._queries.items()):
+				lines.append(f"sms_db_queries_total{_labels(method=method, route=route)} {value}")
+
+			family("sms_db_seconds_total", "counter", "Time spent in SQL statements while serving requests.")
+			for (method, route), value in sorted(self._db_seconds.items()):
+				lines.append(f"sms_db_seconds_total{_labels(method=method, route=route)} {value!r}")
+		return "\n".join(lines) + "\n"
+
+
+def _labels(**labels: str) -> str:
+	def escape(value: str) -> str:
+		return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+	return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in labels.items()) + "}"
+
+
+metrics = MetricsRegistry()
+
+
+def _route_template(scope: Scope) -> str:
+	# Resolve the route before the router runs so in-flight counts carry it too
+	router = scope["app"].router
+	for route in router.routes:
+		match, _ = route.matches(scope)
+		if match == Match.FULL:
+			return getattr(route, "path", UNMATCHED_ROUTE)
+	return UNMATCHED_ROUTE
+
+
+def server_timing(total_seconds: float, stats: RequestStats) -> str:
+	return (
+		f"app;dur={total_seconds * 1000:.1f}, "
+		f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries"'
+	)
+
+
+class MetricsMiddleware:
+	"""ASGI middleware timing every HTTP request and its database work.
+
+	Adds a `Server-Timing` header with the time and queries spent up to the
+	moment the response starts, and records the full request in `metrics`.
+	"""
+
+	def __init__(self, app: ASGIApp, registry: MetricsRegistry = metrics):
+		self.app = app
+		self.registry = registry
+
+	async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+		if scope["type"] != "http":
+			await self.app(scope, receive, send)
+			return
+
+		method = scope["method"]
+		route = _route_template(scope)
+		stats = RequestStats()
+		token = _request_stats.set(stats)
+		started = time.perf_counter()
+		status = 500
+		self.registry.request_started(method, route)
+
+		async def send_with_timing(message: Message) -> None:
+			nonlocal status
+			if message["type"] == "http.response.start":
+				status = message["status"]
+				header = server_timing(time.perf_counter() - started, stats)
+				message["headers"] = [*message.get("headers", ()), (b"server-timing", header.encode("latin-1"))]
+			await send(message)
+
+		try:
+			await self.app(scope, receive, send_with_timing)
+		finally:
+			self.registry.request_finished(method, route, status, time.perf_counter() - started, stats)
+			_request_stats.reset(token)
@@ -8,6 +8,7 @@ from sqlalchemy import (
 	String,
 	DateTime,
 	ForeignKey,
+	Index,
 	UniqueConstraint,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -22,7 +23,7 @@ class Person(Base):
 	id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
 	first_name: Mapped[str] = mapped_column(String(100))
 	last_name: Mapped[str] = mapped_column(String(100))
-	created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+	created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
 
 	# Encapsulation via properties
 	@property
@@ -34,11 +35,13 @@ class Person(Base):
 		return "person"
 
 
+# Child rows are removed by ON DELETE CASCADE in the database; passive_deletes
+# stops the ORM from loading and deleting them one by one first.
 class Student(Person):
 	__tablename__ = "students"
 
 	enrollments: Mapped[list[Enrollment]] = relationship(
-		"Enrollment", back_populates="student", cascade="all, delete-orphan"
+		"Enrollment", back_populates="student", cascade="all, delete-orphan", passive_deletes=True
 	)
 
 	def role_label(self) -> str:
@@ -49,7 +52,7 @@ class Teacher(Person):
 	__tablename__ = "teachers"
 
 	courses: Mapped[list[Course]] = relationship(
-		"Course", back_populates="teacher", cascade="all, delete-orphan"
+		"Course", back_populates="teacher", cascade="all, delete-orphan", passive_deletes=True
 	)
 
 	def role_label(self) -> str:
@@ -62,11 +65,13 @@ class Course(Base):
 	id: Mapped[int] = mapped_column(Integer, primary_key=True)
 	title: Mapped[str] = mapped_column(String(200), unique=True, index=True)
 	capacity: Mapped[int] = mapped_column(Integer, default=30)
-	teacher_id: Mapped[Optional[int]] = mapped_column(ForeignKey("teachers.id"))
+	# Seats taken; maintained by the CRUD layer with guarded UPDATEs
+	enrolled_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+	teacher_id: Mapped[Optional[int]] = mapped_column(ForeignKey("teachers.id", ondelete="CASCADE"), index=True)
 
 	teacher: Mapped[Optional[Teacher]] = relationship("Teacher", back_populates="courses")
 	enrollments: Mapped[list[Enrollment]] = relationship(
-		"Enrollment", back_populates="course", cascade="all, delete-orphan"
+		"Enrollment", back_populates="course", cascade="all, delete-orphan", passive_deletes=True
 	)
 
 
@@ -77,9 +82,10 @@ class Enrollment(Base):
 	)
 
 	id: Mapped[int] = mapped_column(Integer, primary_key=True)
-	student_id: Mapped[int] = mapped_column(ForeignKey("students.id"))
-	course_id: Mapped[int] = mapped_column(ForeignKey("courses.id"))
-	created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+	# Lookups by student use the leading column of uq_student_course
+	student_id: Mapped[int] = mapped_column(ForeignKey("students.id", ondelete="CASCADE"))
+	course_id: Mapped[int] = mapped_column(ForeignKey("courses.id", ondelete="CASCADE"), index=True)
+	created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
 
 	student: Mapped[Student] = relationship("Student", back_populates="enrollments")
 	course: Mapped[Course] = relationship("Course", back_populates="enrollments")
@@ -87,11 +93,22 @@ class Enrollment(Base):
 
 class ScrapedResource(Base):
 	__tablename__ = "scraped_resources"
+	__table_args__ = (
+		UniqueConstraint("source", "url", name="uq_scraped_source_url"),
+		# Per-category price stats and filtered price ranges
+		Index("ix_scraped_category_price", "source", "category_or_author", "currency", "price_amount"),
+		# Price ranges across all sources
+		Index("ix_scraped_price_amount", "price_amount"),
+	)
 
 	id: Mapped[int] = mapped_column(Integer, primary_key=True)
+	# No index of its own: uq_scraped_source_url leads with source
 	source: Mapped[str] = mapped_column(String(50))  # books/quotes
 	title: Mapped[str] = mapped_column(String(300))
 	url: Mapped[str] = mapped_column(String(500))
 	category_or_author: Mapped[str] = mapped_column(String(200))
 	price: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
-	created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
\ No newline at end of file
+	# `price` normalised: integer minor units (pence, cents) and ISO 4217 code
+	price_amount: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+	currency: Mapped[Optional[str]] = mapped_column(String(3), nullable=True)
+	created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, index=True)
\ No newline at end of file
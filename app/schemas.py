@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import re
 from datetime import datetime
+from decimal import Decimal, InvalidOperation
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 
 
 class PersonBase(BaseModel):
@@ -50,6 +52,16 @@ class CourseRead(BaseModel):
 		from_attributes = True
 
 
+class CourseOverview(BaseModel):
+	id: int
+	title: str
+	capacity: int
+	teacher_id: Optional[int]
+	teacher_full_name: Optional[str]
+	enrolled_count: int
+	seats_remaining: int
+
+
 class EnrollmentCreate(BaseModel):
 	student_id: int
 	course_id: int
@@ -65,17 +77,103 @@ class EnrollmentRead(BaseModel):
 		from_attributes = True
 
 
-class ScrapedResourceCreate(BaseModel):
+class EnrollmentBulkItemResult(BaseModel):
+	student_id: int
+	course_id: int
+	accepted: bool
+	enrollment_id: Optional[int] = None
+	reason: Optional[str] = None
+
+
+class EnrollmentBulkResult(BaseModel):
+	accepted: int
+	rejected: int
+	results: list[EnrollmentBulkItemResult]
+
+
+_CURRENCY_SYMBOLS = {"£": "GBP", "$": "USD", "€": "EUR"}
+_PRICE_RE = re.compile(r"(?P<code>[A-Z]{3})?\s*(?P<symbol>[£$€])?\s*(?P<number>\d[\d,]*(?:\.\d+)?)")
+
+
+def parse_price(text: str) -> tuple[str, Optional[int], Optional[str]]:
+	"""Split a display price into (cleaned text, amount in minor units, ISO currency).
+
+	"£51.77" gives ("£51.77", 5177, "GBP"). UTF-8 read as Latin-1 ("Â£51.77",
+	what requests produces when a page omits its charset) is repaired first.
+	"""
+	if "Â" in text:
+		try:
+			text = text.encode("latin-1").decode("utf-8")
+		except UnicodeError:
+			pass
+	text = text.strip()
+	match = _PRICE_RE.search(text)
+	if match is None:
+		return text, None, None
+	try:
+		amount = Decimal(match["number"].replace(",", ""))
+	except InvalidOperation:
+		return text, None, None
+	currency = match["code"] or _CURRENCY_SYMBOLS.get(match["symbol"] or "")
+	return text, int((amount * 100).to_integral_value()), currency
+
+
+class ScrapedResourceBase(BaseModel):
 	source: str
 	title: str
 	url: str
 	category_or_author: str
 	price: Optional[str] = None
-
-
-class ScrapedResourceRead(ScrapedResourceCreate):
+	# `price` normalised: minor units (pence, cents) and ISO code
+	price_amount: Optional[int] = None
+	currency: Optional[str] = None
+
+
+class ScrapedResourceCreate(ScrapedResourceBase):
+	# price_amount/currency are derived from `price` when not given. Read models
+	# skip this and show what the database stores.
+	@model_validator(mode="after")
+	def _normalize_price(self):
+		if self.price is not None:
+			self.price, amount, currency = parse_price(self.price)
+			if self.price_amount is None:
+				self.price_amount = amount
+			if self.currency is None:
+				self.currency = currency
+		return self
+
+
+class ScrapedResourceRead(ScrapedResourceBase):
 	id: int
 	created_at: datetime
 
 	class Config:
-		from_attributes = True
\ No newline at end of file
+		from_attributes = True
+
+
+class ScrapedSearchHit(ScrapedResourceRead):
+	# Relevance, higher is better; only comparable within one result set
+	score: float
+
+
+class ScrapedCategoryStats(BaseModel):
+	source: str
+	category_or_author: str
+	currency: Optional[str]
+	count: int
+	# Minor units, over the rows that have a price
+	min_price_amount: Optional[int]
+	max_price_amount: Optional[int]
+	avg_price_amount: Optional[float]
+
+
+class ScrapedImportResult(BaseModel):
+	inserted: int = 0
+	updated: int = 0
+	unchanged: int = 0
+
+
+class ScrapedImportReport(ScrapedImportResult):
+	rows: int = 0
+	elapsed_seconds: float = 0.0
+	rows_per_second: float = 0.0
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import re
+
+from sqlalchemy import column, func, literal_column, select, table, text
+from sqlalchemy.dialects.mysql import match as mysql_match
+from sqlalchemy.engine import Connection
+
+from . import models
+
+# Full-text index over scraped_resources(title, category_or_author).
+#
+# SQLite: an external-content FTS5 table kept in sync by triggers.
+# Postgres: a GIN index on the tsvector expression the search query uses.
+# MySQL: a FULLTEXT index.
+
+FTS_TABLE = "scraped_resources_fts"
+PG_SEARCH_INDEX = "ix_scraped_resources_search"
+MYSQL_SEARCH_INDEX = "ix_scraped_resources_fulltext"
+# Must match the indexed expression exactly for Postgres to use the index
+PG_SEARCH_VECTOR = "to_tsvector('simple', title || ' ' || category_or_author)"
+
+_SQLITE_DDL = [
+	f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+	"title, category_or_author, content='scraped_resources', content_rowid='id', "
+	"tokenize='unicode61 remove_diacritics 2')",
+	f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON scraped_resources BEGIN "
+	f"INSERT INTO {FTS_TABLE}(rowid, title, category_or_author) "
+	"VALUES (new.id, new.title, new.category_or_author); END",
+	f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON scraped_resources BEGIN "
+	f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, category_or_author) "
+	"VALUES ('delete', old.id, old.title, old.category_or_author); END",
+	f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, category_or_author "
+	f"ON scraped_resources BEGIN "
+	f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, category_or_author) "
+	"VALUES ('delete', old.id, old.title, old.category_or_author); "
+	f"INSERT INTO {FTS_TABLE}(rowid, title, category_or_author) "
+	"VALUES (new.id, new.title, new.category_or_author); END",
+]
+_POSTGRES_DDL = [
+	f"CREATE INDEX IF NOT EXISTS {PG_SEARCH_INDEX} ON scraped_resources USING gin ({PG_SEARCH_VECTOR})",
+]
+_MYSQL_DDL = [
+	f"CREATE FULLTEXT INDEX {MYSQL_SEARCH_INDEX} ON scraped_resources (title, category_or_author)",
+]
+_DDL = {"sqlite": _SQLITE_DDL, "postgresql": _POSTGRES_DDL, "mysql": _MYSQL_DDL}
+
+
+def search_ddl(dialect: str) -> list[str]:
+	"""Statements creating the search index on `dialect`; part of the schema fingerprint."""
+	return _DDL.get(dialect, [])
+
+
+def ensure_search_index(conn: Connection) -> None:
+	"""Create the search index if it is missing. Safe to call repeatedly."""
+	dialect = conn.dialect.name
+	if dialect == "sqlite":
+		# The triggers go away with scraped_resources, so their absence means the
+		# FTS table is missing or out of date and must be rebuilt from the table.
+		has_triggers = conn.execute(
+			text("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = :name"),
+			{"name": f"{FTS_TABLE}_ai"},
+		).first()
+		if has_triggers:
+			return
+		for statement in _SQLITE_DDL:
+			conn.exec_driver_sql(statement)
+		conn.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+	elif dialect == "postgresql":
+		for statement in _POSTGRES_DDL:
+			conn.exec_driver_sql(statement)
+	elif dialect == "mysql":
+		exists = conn.execute(
+			text(
+				"SELECT 1 FROM information_schema.statistics WHERE table_schema = DATABASE() "
+				"AND table_name = 'scraped_resources' AND index_name = :name"
+			),
+			{"name": MYSQL_SEARCH_INDEX},
+		).first()
+		if not exists:
+			for statement in _MYSQL_DDL:
+				conn.exec_driver_sql(statement)
+
+
+def drop_search_index(conn: Connection) -> None:
+	# Only the FTS5 table outlives scraped_resources; the other indexes drop with it
+	if conn.dialect.name == "sqlite":
+		conn.exec_driver_sql(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def _fts5_query(q: str) -> str:
+	# Quote every word so user input is never parsed as FTS5 query syntax
+	return " ".join(f'"{word}"' for word in re.findall(r"\w+", q))
+
+
+def search_statement(
+	dialect: str,
+	q: str,
+	source: str | None = None,
+	category_or_author: str | None = None,
+	limit: int = 20,
+	offset: int = 0,
+):
+	"""Ranked full-text search over title and category_or_author.
+
+	Rows come back best match first with a `score` column where higher is
+	better. Returns None when `q` contains no searchable words.
+	"""
+	resource = models.ScrapedResource
+	columns = [
+		resource.id,
+		resource.source,
+		resource.title,
+		resource.url,
+		resource.category_or_author,
+		resource.price,
+		resource.price_amount,
+		resource.currency,
+		resource.created_at,
+	]
+	if dialect == "sqlite":
+		match = _fts5_query(q)
+		if not match:
+			return None
+		fts = table(FTS_TABLE, column("rowid"), column("rank"))
+		# FTS5's rank is bm25(), lower for better matches; ORDER BY rank lets
+		# FTS5 sort inside the virtual table
+		stmt = (
+			select(*columns, (-fts.c.rank).label("score"))
+			.join_from(resource, fts, fts.c.rowid == resource.id)
+			.where(literal_column(FTS_TABLE).op("MATCH")(match))
+		)
+		order = fts.c.rank
+	elif dialect == "postgresql":
+		vector = literal_column(PG_SEARCH_VECTOR)
+		query = func.plainto_tsquery(literal_column("'simple'"), q)
+		score = func.ts_rank(vector, query)
+		stmt = select(*columns, score.label("score")).where(vector.op("@@")(query))
+		order = score.desc()
+	elif dialect == "mysql":
+		score = mysql_match(resource.title, resource.category_or_author, against=q).in_natural_language_mode()
+		stmt = select(*columns, score.label("score")).where(score)
+		order = score.desc()
+	else:
+		raise ValueError(f"Full-text search is not supported on {dialect}")
+
+	if source is not None:
+		stmt = stmt.where(resource.source == source)
+	if category_or_author is not None:
+		stmt = stmt.where(resource.category_or_author == category_or_author)
+	return stmt.order_by(order, resource.id).limit(limit).offset(offset)
+
+
+def search_scraped(db, q: str, **filters) -> list:
+	stmt = search_statement(db.get_bind().dialect.name, q, **filters)
+	return [] if stmt is None else db.execute(stmt).all()
@@ -0,0 +1,172 @@
+"""Drive the hot API routes with concurrent clients and report latency percentiles.
+
+By default a fresh SQLite database is seeded and the app is served in-process
+through httpx's ASGI transport. With --url the same load goes over HTTP to a
+running server (seed its database first with benchmarks.seed, or pass --db to
+seed it from here).
+
+Usage:
+	python -m benchmarks.bench_api --requests 500 --concurrency 16
+	python -m benchmarks.bench_api --url http://127.0.0.1:8000 --scenario list_students
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from typing import Awaitable, Callable
+
+import httpx
+
+from .seed import add_seed_arguments, seed_from_args
+
+IMPORT_BATCH = 100
+
+Request = Callable[[httpx.AsyncClient, random.Random, int], Awaitable[httpx.Response]]
+
+
+def _enroll(ids: dict[str, list[int]]) -> Request:
+	def call(client: httpx.AsyncClient, rng: random.Random, n: int):
+		body = {"student_id": rng.choice(ids["students"]), "course_id": rng.choice(ids["courses"])}
+		return client.post("/enrollments", json=body)
+
+	return call
+
+
+def _list(path: str) -> Request:
+	def call(client: httpx.AsyncClient, rng: random.Random, n: int):
+		return client.get(path, params={"limit": 100})
+
+	return call
+
+
+def _import(client: httpx.AsyncClient, rng: random.Random, n: int):
+	# Half new rows, half re-scrapes of rows sent by earlier requests
+	items = [
+		{
+			"source": "bench",
+			"title": f"Item {n}-{i}",
+			"url": f"/bench/{rng.randrange(n * IMPORT_BATCH + 1) if i % 2 else n * IMPORT_BATCH + i}",
+			"category_or_author": "Bench",
+			"price": f"£{rng.randrange(100, 10_000) / 100:.2f}",
+		}
+		for i in range(IMPORT_BATCH)
+	]
+	return client.post("/scraped/import", json=items)
+
+
+def scenarios(ids: dict[str, list[int]]) -> dict[str, Request]:
+	return {
+		"enroll": _enroll(ids),
+		"list_students": _list("/students"),
+		"list_courses": _list("/courses"),
+		"list_enrollments": _list("/enrollments"),
+		"course_overview": _list("/courses/overview"),
+		"scraped_import": _import,
+	}
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict[str, float]:
+	"""p50/p95/p99 in milliseconds and throughput in requests per second."""
+	ms = sorted(value * 1000 for value in latencies)
+	cuts = statistics.quantiles(ms, n=100, method="inclusive") if len(ms) > 1 else ms * 99
+	return {
+		"requests": len(ms),
+		"errors": errors,
+		"p50_ms": round(cuts[49], 2),
+		"p95_ms": round(cuts[94], 2),
+		"p99_ms": round(cuts[98], 2),
+		"max_ms": round(ms[-1], 2),
+		"throughput_rps": round(len(ms) / elapsed, 1),
+	}
+
+
+async def run_scenario(
+	client: httpx.AsyncClient, call: Request, requests: int, concurrency: int, seed: int
+) -> dict[str, float]:
+	latencies: list[float] = []
+	errors = 0
+	counter = iter(range(requests))
+
+	async def worker(worker_id: int) -> None:
+		nonlocal errors
+		rng = random.Random(seed * 1000 + worker_id)
+		for n in counter:
+			start = time.perf_counter()
+			resp = await call(client, rng, n)
+			latencies.append(time.perf_counter() - start)
+			# 400s are business-rule rejections (full course, duplicate), not failures
+			if resp.status_code >= 500:
+				errors += 1
+
+	started = time.perf_counter()
+	await asyncio.gather(*(worker(i) for i in range(concurrency)))
+	return summarize(latencies, errors, time.perf_counter() - started)
+
+
+async def _entity_ids(client: httpx.AsyncClient, entity: str) -> list[int]:
+	resp = await client.get(f"/export/{entity}", params={"format": "csv", "columns": "id"})
+	resp.raise_for_status()
+	return [int(line) for line in resp.text.splitlines()[1:]]
+
+
+async def run(args: argparse.Namespace) -> dict:
+	if args.url:
+		transport = httpx.AsyncHTTPTransport(limits=httpx.Limits(max_connections=args.concurrency))
+		base_url = args.url
+	else:
+		from app.main import app
+
+		transport = httpx.ASGITransport(app=app)
+		base_url = "http://bench"
+
+	async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=60.0) as client:
+		ids = {entity: await _entity_ids(client, entity) for entity in ("students", "courses")}
+		if not ids["students"] or not ids["courses"]:
+			raise SystemExit("Target database has no students or courses; seed it first")
+		available = scenarios(ids)
+		results = {}
+		for name in args.scenario or list(available):
+			results[name] = await run_scenario(
+				client, available[name], args.requests, args.concurrency, args.seed
+			)
+	return {
+		"target": args.url or "in-process",
+		"concurrency": args.concurrency,
+		"results": results,
+	}
+
+
+def main(argv: list[str] | None = None) -> int:
+	parser = argparse.ArgumentParser(description="Load-test the hot API routes")
+	parser.add_argument("--url", help="Base URL of a running server; default serves the app in-process")
+	parser.add_argument("--db", help="Database URL to seed (default: a temporary SQLite file in-process)")
+	parser.add_argument("--no-seed", action="store_true", help="Use the database as it is")
+	parser.add_argument("--requests", type=int, default=500, help="Requests per scenario")
+	parser.add_argument("--concurrency", type=int, default=16)
+	parser.add_argument("--scenario", action="append", choices=sorted(scenarios({})))
+	add_seed_arguments(parser)
+	args = parser.parse_args(argv)
+
+	from app.config import override_settings
+
+	if args.db:
+		override_settings(DATABASE_URL=args.db)
+	elif not args.url:
+		db_path = os.path.join(tempfile.mkdtemp(prefix="sms-bench-"), "bench.db")
+		override_settings(DATABASE_URL=f"sqlite:///{db_path}")
+	report = {}
+	if not args.no_seed and (args.db or not args.url):
+		report["seeded"] = seed_from_args(args)
+	report.update(asyncio.run(run(args)))
+	print(json.dumps(report, indent=2))
+	return 0
+
+
+if __name__ == "__main__":
+	raise SystemExit(main())
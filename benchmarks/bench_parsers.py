@@ -0,0 +1,88 @@
+"""Parse the stored HTML fixtures repeatedly and report pages/sec per backend.
+
+Usage:
+	python -m benchmarks.bench_parsers --iterations 2000
+	python -m benchmarks.bench_parsers --save-baseline   # record this machine's rates
+	python -m benchmarks.bench_parsers --check           # exit 1 on a regression
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import scrape
+
+FIXTURES = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+BASELINE = Path(__file__).resolve().parent / "baselines" / "parsers.json"
+# Allowed slowdown against the baseline before a case counts as a regression
+DEFAULT_TOLERANCE = 0.25
+CASES = {
+	"books": (FIXTURES / "books_page.html", scrape.parse_books),
+	"quotes": (FIXTURES / "quotes_page.html", scrape.parse_quotes),
+}
+
+
+def bench(iterations: int, backends: list[str] | None = None) -> dict[str, dict[str, float]]:
+	results: dict[str, dict[str, float]] = {}
+	for backend in backends or list(scrape.PARSER_BACKENDS):
+		results[backend] = {}
+		for case, (path, parse) in CASES.items():
+			html = path.read_text(encoding="utf-8")
+			parse(html, backend)  # warm up
+			start = time.perf_counter()
+			for _ in range(iterations):
+				parse(html, backend)
+			elapsed = time.perf_counter() - start
+			results[backend][case] = round(iterations / elapsed, 1)
+	return results
+
+
+def regressions(
+	results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], tolerance: float
+) -> list[str]:
+	"""Cases whose pages/sec fell more than `tolerance` below the baseline."""
+	found = []
+	for backend, rates in results.items():
+		for case, rate in rates.items():
+			expected = baseline.get(backend, {}).get(case)
+			if expected and rate < expected * (1 - tolerance):
+				found.append(f"{backend}/{case}: {rate:.1f} pages/s vs baseline {expected:.1f}")
+	return found
+
+
+def main(argv: list[str] | None = None) -> int:
+	parser = argparse.ArgumentParser(description="Benchmark scraper HTML parser backends")
+	parser.add_argument("--iterations", type=int, default=2000)
+	parser.add_argument("--backend", action="append", choices=sorted(scrape.PARSER_BACKENDS))
+	parser.add_argument("--json", action="store_true", help="Print results as JSON")
+	parser.add_argument("--baseline", type=Path, default=BASELINE, help="Baseline file to save or check")
+	parser.add_argument("--save-baseline", action="store_true", help="Write the results to --baseline")
+	parser.add_argument("--check", action="store_true", help="Fail if slower than --baseline")
+	parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+	args = parser.parse_args(argv)
+
+	results = bench(args.iterations, args.backend)
+	if args.json:
+		print(json.dumps(results, indent=2))
+	else:
+		print(f"{'backend':<12} " + " ".join(f"{case + ' pages/s':>16}" for case in CASES))
+		for backend, rates in results.items():
+			print(f"{backend:<12} " + " ".join(f"{rates[case]:>16.1f}" for case in CASES))
+
+	if args.save_baseline:
+		args.baseline.parent.mkdir(parents=True, exist_ok=True)
+		args.baseline.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+	if args.check:
+		baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+		found = regressions(results, baseline, args.tolerance)
+		for line in found:
+			print(f"REGRESSION {line}", file=sys.stderr)
+		return 1 if found else 0
+	return 0
+
+
+if __name__ == "__main__":
+	raise SystemExit(main())
@@ -0,0 +1,124 @@
+"""Time /scraped/search queries over a large synthetic scraped_resources table.
+
+Fills a temporary SQLite database (or --db) with random titles, then runs
+random one- and two-word queries through the full-text index and, for
+comparison, through a naive LIKE '%term%' scan.
+
+Usage:
+	python -m benchmarks.bench_search --rows 1000000 --queries 200
+"""
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+SYLLABLES = "ka lo mi ne ru sa ti vo ze ba de fi go hu ja ke li mo nu pe".split()
+VOCABULARY = 20_000
+CATEGORIES = ["Poetry", "Fiction", "History", "Travel", "Mystery", "Science", "Romance", "Fantasy"]
+AUTHORS = ["Albert Einstein", "Jane Austen", "Mark Twain", "J.K. Rowling", "Marilyn Monroe"]
+INSERT_BATCH = 50_000
+
+
+def vocabulary(rng: random.Random) -> tuple[list[str], list[float]]:
+	"""Synthetic words and cumulative Zipf weights, like titles in a real catalogue."""
+	words = set()
+	while len(words) < VOCABULARY:
+		words.add("".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))))
+	words = sorted(words)
+	rng.shuffle(words)
+	return words, list(itertools.accumulate(1 / rank for rank in range(1, VOCABULARY + 1)))
+
+
+def fill(rows: int, seed: int) -> None:
+	from sqlalchemy import insert
+
+	from app import models
+	from app.db import SessionLocal, init_db
+
+	init_db()
+	rng = random.Random(seed)
+	words, weights = vocabulary(rng)
+	now = datetime.utcnow()
+	with SessionLocal() as db:
+		for start in range(0, rows, INSERT_BATCH):
+			batch = []
+			for n in range(start, min(start + INSERT_BATCH, rows)):
+				is_book = n % 4 != 0
+				batch.append({
+					"source": "books" if is_book else "quotes",
+					"title": " ".join(rng.choices(words, cum_weights=weights, k=rng.randint(2, 6))).capitalize(),
+					"url": f"/item/{n}",
+					"category_or_author": rng.choice(CATEGORIES if is_book else AUTHORS),
+					"price": f"£{rng.randrange(100, 6000) / 100:.2f}" if is_book else None,
+					"created_at": now,
+				})
+			db.execute(insert(models.ScrapedResource), batch)
+			db.commit()
+
+
+def timed(fn, queries: list[str]) -> dict[str, float]:
+	ms = []
+	for q in queries:
+		start = time.perf_counter()
+		fn(q)
+		ms.append((time.perf_counter() - start) * 1000)
+	cuts = statistics.quantiles(ms, n=100, method="inclusive")
+	return {"p50_ms": round(cuts[49], 2), "p95_ms": round(cuts[94], 2), "p99_ms": round(cuts[98], 2)}
+
+
+def main(argv: list[str] | None = None) -> int:
+	parser = argparse.ArgumentParser(description="Benchmark full-text search on scraped resources")
+	parser.add_argument("--rows", type=int, default=1_000_000)
+	parser.add_argument("--queries", type=int, default=200)
+	parser.add_argument("--like-queries", type=int, default=10, help="LIKE scans to time; 0 to skip")
+	parser.add_argument("--db", help="Database URL to reset and fill (default: temporary SQLite)")
+	parser.add_argument("--seed", type=int, default=0)
+	args = parser.parse_args(argv)
+
+	from app.config import override_settings
+
+	url = args.db or "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="sms-bench-"), "search.db")
+	override_settings(DATABASE_URL=url)
+
+	from sqlalchemy import or_, select
+
+	from app import models
+	from app.db import SessionLocal
+	from app.search import search_scraped
+
+	started = time.perf_counter()
+	fill(args.rows, args.seed)
+	report: dict = {"rows": args.rows, "fill_seconds": round(time.perf_counter() - started, 1)}
+
+	words, weights = vocabulary(random.Random(args.seed))
+	rng = random.Random(args.seed + 1)
+	queries = [" ".join(rng.choices(words, cum_weights=weights, k=rng.randint(1, 2))) for _ in range(args.queries)]
+	with SessionLocal() as db:
+		report["fts"] = timed(lambda q: search_scraped(db, q, limit=20), queries)
+		report["fts_filtered"] = timed(
+			lambda q: search_scraped(db, q, source="books", category_or_author="Poetry", limit=20), queries
+		)
+		if args.like_queries:
+			resource = models.ScrapedResource
+
+			def like(q: str):
+				pattern = f"%{q}%"
+				stmt = select(resource.id, resource.title).where(
+					or_(resource.title.ilike(pattern), resource.category_or_author.ilike(pattern))
+				).limit(20)
+				return db.execute(stmt).all()
+
+			report["like_scan"] = timed(like, queries[: max(args.like_queries, 2)])
+	print(json.dumps(report, indent=2))
+	return 0
+
+
+if __name__ == "__main__":
+	raise SystemExit(main())
@@ -0,0 +1,75 @@
+"""Compare list-endpoint serialization before and after the row-tuple path.
+
+before: ORM objects -> per-row response_model validation -> stdlib json
+after:  selected columns as row tuples -> one pydantic-core to_json call
+
+Usage:
+	python -m benchmarks.bench_serialization --rows 10000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+
+from pydantic import TypeAdapter
+
+
+def main(argv: list[str] | None = None) -> int:
+	parser = argparse.ArgumentParser(description="Benchmark list endpoint serialization")
+	parser.add_argument("--rows", type=int, default=10_000)
+	parser.add_argument("--repeat", type=int, default=5)
+	args = parser.parse_args(argv)
+
+	from app.config import override_settings
+
+	db_path = os.path.join(tempfile.mkdtemp(prefix="sms-bench-"), "bench.db")
+	override_settings(DATABASE_URL=f"sqlite:///{db_path}")
+
+	from sqlalchemy import insert
+
+	from app import crud, models, schemas
+	from app.db import SessionLocal, init_db
+	from app.pagination import rows_response
+
+	init_db()
+	now = datetime.utcnow()
+	with SessionLocal() as db:
+		db.execute(
+			insert(models.Student),
+			[{"first_name": f"First{n}", "last_name": f"Last{n}", "created_at": now} for n in range(args.rows)],
+		)
+		db.commit()
+
+	adapter = TypeAdapter(list[schemas.StudentRead])
+
+	def before() -> bytes:
+		with SessionLocal() as db:
+			objs = crud.list_students(db, 0, args.rows)
+			content = adapter.dump_python(adapter.validate_python(objs, from_attributes=True), mode="json")
+		return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+	def after() -> bytes:
+		with SessionLocal() as db:
+			rows = crud.list_rows(db, models.Student, schemas.StudentRead, 0, args.rows)
+		return rows_response(rows, args.rows).body
+
+	assert before() == after(), "serialized bodies differ"
+	results: dict[str, float] = {"rows": args.rows}
+	for name, fn in (("before", before), ("after", after)):
+		timings = []
+		for _ in range(args.repeat):
+			start = time.perf_counter()
+			fn()
+			timings.append(time.perf_counter() - start)
+		results[f"{name}_best_ms"] = round(min(timings) * 1000, 2)
+	results["speedup"] = round(results["before_best_ms"] / results["after_best_ms"], 2)
+	print(json.dumps(results, indent=2))
+	return 0
+
+
+if __name__ == "__main__":
+	raise SystemExit(main())
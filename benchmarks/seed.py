@@ -0,0 +1,116 @@
+"""Fill a database with synthetic students, teachers, courses and enrollments.
+
+Usage:
+	python -m benchmarks.seed --db sqlite:///./bench.db --students 10000 --courses 200
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+from datetime import datetime
+
+from sqlalchemy import insert, select, update
+
+
+def seed(
+	students: int = 1000,
+	teachers: int = 50,
+	courses: int = 100,
+	enrollments: int = 2000,
+	capacity: int = 100,
+	seed: int = 0,
+) -> dict[str, int]:
+	"""Reset the configured database and insert the requested row counts.
+
+	Enrollments are distinct random (student, course) pairs that respect each
+	course's capacity, and `enrolled_count` is set to match.
+	"""
+	from app import models
+	from app.db import SessionLocal, init_db
+
+	init_db()
+	rng = random.Random(seed)
+	now = datetime.utcnow()
+	with SessionLocal() as db:
+		for model, count in ((models.Student, students), (models.Teacher, teachers)):
+			if count:
+				db.execute(
+					insert(model),
+					[{"first_name": f"First{n}", "last_name": f"Last{n}", "created_at": now} for n in range(count)],
+				)
+		teacher_ids = list(db.execute(select(models.Teacher.id)).scalars())
+		if courses:
+			db.execute(
+				insert(models.Course),
+				[
+					{
+						"title": f"Course {n}",
+						"capacity": capacity,
+						"teacher_id": rng.choice(teacher_ids) if teacher_ids else None,
+					}
+					for n in range(courses)
+				],
+			)
+		student_ids = list(db.execute(select(models.Student.id)).scalars())
+		course_ids = list(db.execute(select(models.Course.id)).scalars())
+
+		wanted = min(enrollments, len(student_ids) * len(course_ids), len(course_ids) * capacity)
+		pairs: set[tuple[int, int]] = set()
+		taken = dict.fromkeys(course_ids, 0)
+		open_courses = list(course_ids)
+		while len(pairs) < wanted and open_courses:
+			course_id = rng.choice(open_courses)
+			pair = (rng.choice(student_ids), course_id)
+			if pair in pairs:
+				continue
+			pairs.add(pair)
+			taken[course_id] += 1
+			if taken[course_id] >= capacity:
+				open_courses.remove(course_id)
+		if pairs:
+			db.execute(
+				insert(models.Enrollment),
+				[{"student_id": s, "course_id": c, "created_at": now} for s, c in pairs],
+			)
+			db.execute(
+				update(models.Course),
+				[{"id": course_id, "enrolled_count": n} for course_id, n in taken.items() if n],
+			)
+		db.commit()
+	return {
+		"students": len(student_ids),
+		"teachers": len(teacher_ids),
+		"courses": len(course_ids),
+		"enrollments": len(pairs),
+	}
+
+
+def add_seed_arguments(parser: argparse.ArgumentParser) -> None:
+	parser.add_argument("--students", type=int, default=1000)
+	parser.add_argument("--teachers", type=int, default=50)
+	parser.add_argument("--courses", type=int, default=100)
+	parser.add_argument("--enrollments", type=int, default=2000)
+	parser.add_argument("--capacity", type=int, default=100, help="Seats per course")
+	parser.add_argument("--seed", type=int, default=0, help="Random seed for reproducible data")
+
+
+def seed_from_args(args: argparse.Namespace) -> dict[str, int]:
+	return seed(args.students, args.teachers, args.courses, args.enrollments, args.capacity, args.seed)
+
+
+def main(argv: list[str] | None = None) -> int:
+	parser = argparse.ArgumentParser(description="Seed a database with synthetic data (destroys existing rows)")
+	parser.add_argument("--db", required=True, help="Database URL to reset and fill")
+	add_seed_arguments(parser)
+	args = parser.parse_args(argv)
+
+	from app.config import override_settings
+
+	override_settings(DATABASE_URL=args.db)
+	print(json.dumps(seed_from_args(args), indent=2))
+	return 0
+
+
+if __name__ == "__main__":
+	raise SystemExit(main())
@@ -1,76 +1,329 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
+import hashlib
 import json
 import sys
+import threading
+import time
+from collections import deque
+from itertools import islice
 from pathlib import Path
-from urllib.parse import urljoin
+from typing import AsyncIterator, Callable, Iterable, Iterator, Mapping, NamedTuple, Optional, TextIO
+from urllib.parse import urljoin, urlsplit
 from urllib.robotparser import RobotFileParser
 
+import httpx
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from sqlalchemy.orm import Session
 
-from app.config import get_settings
-from app.db import SessionLocal, init_db
-from app.schemas import ScrapedResourceCreate
+try:  # optional faster parser backends
+	import lxml
+except ImportError:  # pragma: no cover - depends on environment
+	lxml = None
+try:
+	from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:  # pragma: no cover - depends on environment
+	SelectolaxParser = None
+
+from app.config import get_settings, override_settings
+from app.db import SessionLocal, ensure_schema, reset_engine
+from app.schemas import ScrapedImportResult, ScrapedResourceCreate
 
 BOOKS_BASE = "https://books.toscrape.com/"
 QUOTES_BASE = "https://quotes.toscrape.com/"
+DEFAULT_CONCURRENCY = 8
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_CACHE_DIR = ".scrape-cache"
+ROBOTS_TTL = 3600.0
 
+# Parsed robots.txt per scheme://host: (fetched_at, parser or None if unreadable)
+_robots_cache: dict[str, tuple[float, RobotFileParser | None]] = {}
+# Guards the two dicts; fetches hold only their host's lock so one slow host
+# never blocks robots checks for the others
+_robots_lock = threading.Lock()
+_robots_host_locks: dict[str, threading.Lock] = {}
 
-def can_fetch(base_url: str, user_agent: str, path: str) -> bool:
-	rp = RobotFileParser()
-	rp.set_url(urljoin(base_url, "robots.txt"))
-	try:
-		rp.read()
-		return rp.can_fetch(user_agent, urljoin(base_url, path))
-	except Exception:
+
+def _cached_robots(host: str, ttl: float) -> tuple[float, RobotFileParser | None] | None:
+	with _robots_lock:
+		cached = _robots_cache.get(host)
+	if cached is not None and time.monotonic() - cached[0] < ttl:
+		return cached
+	return None
+
+
+def _robots_parser(base_url: str, ttl: float) -> RobotFileParser | None:
+	parts = urlsplit(base_url)
+	host = f"{parts.scheme}://{parts.netloc}"
+	cached = _cached_robots(host, ttl)
+	if cached is not None:
+		return cached[1]
+	with _robots_lock:
+		host_lock = _robots_host_locks.setdefault(host, threading.Lock())
+	with host_lock:
+		# Another thread may have fetched it while this one waited
+		cached = _cached_robots(host, ttl)
+		if cached is not None:
+			return cached[1]
+		rp: RobotFileParser | None = RobotFileParser()
+		rp.set_url(urljoin(host + "/", "robots.txt"))
+		try:
+			rp.read()
+		except Exception:
+			rp = None
+		with _robots_lock:
+			_robots_cache[host] = (time.monotonic(), rp)
+		return rp
+
+
+def clear_robots_cache() -> None:
+	with _robots_lock:
+		_robots_cache.clear()
+		_robots_host_locks.clear()
+
+
+def can_fetch(base_url: str, user_agent: str, path: str, ttl: float = ROBOTS_TTL) -> bool:
+	rp = _robots_parser(base_url, ttl)
+	if rp is None:
 		return True
+	return rp.can_fetch(user_agent, urljoin(base_url, path))
+
+
+class Page(NamedTuple):
+	url: str
+	text: str
+	not_modified: bool = False
+
 
+class ResponseCache:
+	"""On-disk HTTP cache keyed by URL.
 
-def fetch_page(url: str, user_agent: str) -> str:
+	Stores the body with its `ETag`/`Last-Modified` validators so re-crawls can
+	send conditional requests, plus the items parsed from that body so a 304
+	response skips parsing entirely.
+	"""
+
+	def __init__(self, directory: Path | str):
+		self.directory = Path(directory)
+		self.directory.mkdir(parents=True, exist_ok=True)
+
+	def _path(self, url: str, suffix: str) -> Path:
+		key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+		return self.directory / f"{key}.{suffix}"
+
+	def _meta(self, url: str) -> dict | None:
+		try:
+			return json.loads(self._path(url, "meta.json").read_text(encoding="utf-8"))
+		except (OSError, ValueError):
+			return None
+
+	def conditional_headers(self, url: str) -> dict[str, str]:
+		meta = self._meta(url)
+		if meta is None or not self._path(url, "body").exists():
+			return {}
+		headers = {}
+		if meta.get("etag"):
+			headers["If-None-Match"] = meta["etag"]
+		if meta.get("last_modified"):
+			headers["If-Modified-Since"] = meta["last_modified"]
+		return headers
+
+	def body(self, url: str) -> str | None:
+		try:
+			return self._path(url, "body").read_text(encoding="utf-8")
+		except OSError:
+			return None
+
+	def store(self, url: str, text: str, headers: Mapping[str, str]) -> None:
+		etag = headers.get("ETag")
+		last_modified = headers.get("Last-Modified")
+		# Drop any items parsed from the previous body
+		self._path(url, "items.json").unlink(missing_ok=True)
+		if not etag and not last_modified:
+			# Nothing to revalidate with
+			self._path(url, "body").unlink(missing_ok=True)
+			self._path(url, "meta.json").unlink(missing_ok=True)
+			return
+		self._path(url, "body").write_text(text, encoding="utf-8")
+		meta = {"url": url, "etag": etag, "last_modified": last_modified}
+		self._path(url, "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+
+	def items(self, url: str) -> list[ScrapedResourceCreate] | None:
+		try:
+			raw = json.loads(self._path(url, "items.json").read_text(encoding="utf-8"))
+		except (OSError, ValueError):
+			return None
+		return [ScrapedResourceCreate(**item) for item in raw]
+
+	def store_items(self, url: str, items: list[ScrapedResourceCreate]) -> None:
+		if not self._path(url, "body").exists():
+			return
+		data = [i.model_dump() for i in items]
+		self._path(url, "items.json").write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+
+def fetch(url: str, user_agent: str, cache: ResponseCache | None = None) -> Page:
 	headers = {"User-Agent": user_agent}
+	if cache is not None:
+		headers.update(cache.conditional_headers(url))
 	response = requests.get(url, headers=headers, timeout=20)
+	if response.status_code == 304 and cache is not None:
+		body = cache.body(url)
+		if body is not None:
+			return Page(url, body, not_modified=True)
 	response.raise_for_status()
-	return response.text
+	if cache is not None:
+		cache.store(url, response.text, response.headers)
+	return Page(url, response.text)
 
 
-def parse_books(html: str) -> list[ScrapedResourceCreate]:
-	soup = BeautifulSoup(html, "html.parser")
-	items: list[ScrapedResourceCreate] = []
-	for li in soup.select("ol.row li"):  # product list
-		title_el = li.select_one("h3 a")
-		price_el = li.select_one(".price_color")
+def fetch_page(url: str, user_agent: str, cache: ResponseCache | None = None) -> str:
+	return fetch(url, user_agent, cache).text
+
+
+def make_async_client(user_agent: str, concurrency: int = DEFAULT_CONCURRENCY) -> httpx.AsyncClient:
+	"""Build a pooled keep-alive client sized to the crawl concurrency."""
+	limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+	return httpx.AsyncClient(
+		headers={"User-Agent": user_agent},
+		timeout=20,
+		limits=limits,
+		follow_redirects=True,
+	)
+
+
+async def fetch_async(
+	client: httpx.AsyncClient, url: str, cache: ResponseCache | None = None
+) -> Page:
+	headers = cache.conditional_headers(url) if cache is not None else {}
+	response = await client.get(url, headers=headers)
+	if response.status_code == 304 and cache is not None:
+		body = cache.body(url)
+		if body is not None:
+			return Page(url, body, not_modified=True)
+	response.raise_for_status()
+	if cache is not None:
+		cache.store(url, response.text, response.headers)
+	return Page(url, response.text)
+
+
+async def fetch_page_async(
+	client: httpx.AsyncClient, url: str, cache: ResponseCache | None = None
+) -> str:
+	return (await fetch_async(client, url, cache)).text
+
+
+# HTML parser backends
+#
+# Each backend extracts raw fields; parse_books/parse_quotes build the models so
+# every backend yields identical output. BeautifulSoup backends only build the
+# product/quote containers (SoupStrainer) instead of the whole document.
+
+_BOOKS_STRAINER = SoupStrainer(["ul", "ol"], class_=["breadcrumb", "row"])
+_QUOTES_STRAINER = SoupStrainer("div", class_="quote")
+
+BookRow = tuple[str, str, Optional[str], str]  # title, url, price, category
+QuoteRow = tuple[str, str, str]  # raw text, author, url
+
+
+class _SoupBackend:
+	def __init__(self, features: str):
+		self.features = features
+
+	def book_rows(self, html: str) -> Iterator[BookRow]:
+		soup = BeautifulSoup(html, self.features, parse_only=_BOOKS_STRAINER)
 		category = soup.select_one(".breadcrumb li.active")
-		if not title_el:
-			continue
-		title = title_el.get("title") or title_el.text.strip()
-		url = title_el.get("href", "").strip()
-		price = price_el.text.strip() if price_el else None
 		cat = category.text.strip() if category else ""
-		items.append(
-			ScrapedResourceCreate(
-				source="books",
-				title=title,
-				url=url,
-				category_or_author=cat,
-				price=price,
-			)
+		for li in soup.select("ol.row li"):  # product list
+			title_el = li.select_one("h3 a")
+			if not title_el:
+				continue
+			price_el = li.select_one(".price_color")
+			title = title_el.get("title") or title_el.text.strip()
+			url = title_el.get("href", "").strip()
+			price = price_el.text.strip() if price_el else None
+			yield title, url, price, cat
+
+	def quote_rows(self, html: str) -> Iterator[QuoteRow]:
+		soup = BeautifulSoup(html, self.features, parse_only=_QUOTES_STRAINER)
+		for div in soup.select("div.quote"):
+			text_el = div.select_one("span.text")
+			author_el = div.select_one("small.author")
+			if not text_el or not author_el:
+				continue
+			link_el = div.select_one("span a")
+			url = link_el.get("href", "").strip() if link_el else ""
+			yield text_el.text.strip(), author_el.text.strip(), url
+
+
+class _SelectolaxBackend:
+	def book_rows(self, html: str) -> Iterator[BookRow]:
+		tree = SelectolaxParser(html)
+		category = tree.css_first(".breadcrumb li.active")
+		cat = category.text().strip() if category else ""
+		for li in tree.css("ol.row li"):
+			title_el = li.css_first("h3 a")
+			if not title_el:
+				continue
+			price_el = li.css_first(".price_color")
+			title = title_el.attributes.get("title") or title_el.text().strip()
+			url = (title_el.attributes.get("href") or "").strip()
+			price = price_el.text().strip() if price_el else None
+			yield title, url, price, cat
+
+	def quote_rows(self, html: str) -> Iterator[QuoteRow]:
+		tree = SelectolaxParser(html)
+		for div in tree.css("div.quote"):
+			text_el = div.css_first("span.text")
+			author_el = div.css_first("small.author")
+			if not text_el or not author_el:
+				continue
+			link_el = div.css_first("span a")
+			url = (link_el.attributes.get("href") or "").strip() if link_el else ""
+			yield text_el.text().strip(), author_el.text().strip(), url
+
+
+PARSER_BACKENDS: dict[str, object] = {"html.parser": _SoupBackend("html.parser")}
+if lxml is not None:
+	PARSER_BACKENDS["lxml"] = _SoupBackend("lxml")
+if SelectolaxParser is not None:
+	PARSER_BACKENDS["selectolax"] = _SelectolaxBackend()
+
+# Fastest installed backend first
+DEFAULT_PARSER = next(
+	name for name in ("selectolax", "lxml", "html.parser") if name in PARSER_BACKENDS
+)
+
+
+def get_parser_backend(name: str | None = None):
+	name = name or DEFAULT_PARSER
+	try:
+		return PARSER_BACKENDS[name]
+	except KeyError:
+		raise ValueError(
+			f"Parser backend '{name}' is not available. Installed: {', '.join(PARSER_BACKENDS)}"
+		) from None
+
+
+def parse_books(html: str, backend: str | None = None) -> list[ScrapedResourceCreate]:
+	return [
+		ScrapedResourceCreate(
+			source="books",
+			title=title,
+			url=url,
+			category_or_author=cat,
+			price=price,
 		)
-	return items
+		for title, url, price, cat in get_parser_backend(backend).book_rows(html)
+	]
 
 
-def parse_quotes(html: str) -> list[ScrapedResourceCreate]:
-	soup = BeautifulSoup(html, "html.parser")
+def parse_quotes(html: str, backend: str | None = None) -> list[ScrapedResourceCreate]:
 	items: list[ScrapedResourceCreate] = []
-	for div in soup.select("div.quote"):
-		text_el = div.select_one("span.text")
-		author_el = div.select_one("small.author")
-		if not text_el or not author_el:
-			continue
-		# Normalize curly quotes and surrounding punctuation to plain text
-		raw = text_el.text.strip()
+	for raw, author, url in get_parser_backend(backend).quote_rows(html):
 		# Replace common curly quotes with straight quotes
 		normalized = (
 			raw.replace("“", "\"")
@@ -81,14 +334,10 @@ def parse_quotes(html: str) -> list[ScrapedResourceCreate]:
 		# Trim surrounding quotes if present
 		if normalized.startswith('"') and normalized.endswith('"'):
 			normalized = normalized[1:-1]
-		title = normalized
-		author = author_el.text.strip()
-		link_el = div.select_one("span a")
-		url = link_el.get("href", "").strip() if link_el else ""
 		items.append(
 			ScrapedResourceCreate(
 				source="quotes",
-				title=title,
+				title=normalized,
 				url=url,
 				category_or_author=author,
 				price=None,
@@ -97,51 +346,273 @@ def parse_quotes(html: str) -> list[ScrapedResourceCreate]:
 	return items
 
 
+def site_pages(site: str, pages: int) -> tuple[str, list[str], Callable[..., list[ScrapedResourceCreate]]]:
+	"""Return the base URL, page URLs in crawl order and parser for a site."""
+	if site == "books":
+		urls = [
+			urljoin(BOOKS_BASE, f"catalogue/page-{page}.html") if page > 1 else BOOKS_BASE
+			for page in range(1, pages + 1)
+		]
+		return BOOKS_BASE, urls, parse_books
+	if site == "quotes":
+		urls = [urljoin(QUOTES_BASE, f"page/{page}/") for page in range(1, pages + 1)]
+		return QUOTES_BASE, urls, parse_quotes
+	raise ValueError("Unsupported site. Use 'books' or 'quotes'.")
+
+
+async def iter_pages_async(
+	client: httpx.AsyncClient,
+	urls: Iterable[str],
+	cache: ResponseCache | None = None,
+	concurrency: int = DEFAULT_CONCURRENCY,
+	buffer: int | None = None,
+) -> AsyncIterator[Page]:
+	"""Yield pages in crawl order with up to `concurrency` fetches in flight.
+
+	A new fetch starts as soon as any slot frees up. Pages that finish early
+	wait in an ordered buffer of at most `buffer` pages (default: twice the
+	concurrency), which bounds memory while an earlier page is still loading.
+	"""
+	if concurrency < 1:
+		raise ValueError("concurrency must be at least 1")
+	buffer = max(buffer or 2 * concurrency, concurrency)
+	semaphore = asyncio.Semaphore(concurrency)
+
+	async def fetch_one(url: str) -> Page:
+		async with semaphore:
+			return await fetch_async(client, url, cache)
+
+	remaining = iter(urls)
+	tasks: deque[asyncio.Task[Page]] = deque()
+
+	def fill() -> None:
+		for url in islice(remaining, buffer - len(tasks)):
+			tasks.append(asyncio.create_task(fetch_one(url)))
+
+	fill()
+	try:
+		while tasks:
+			page = await tasks.popleft()
+			fill()
+			yield page
+	finally:
+		for task in tasks:
+			task.cancel()
+		await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def iter_pages(
+	site: str,
+	pages: int,
+	user_agent: str,
+	concurrency: int = 1,
+	cache: ResponseCache | None = None,
+) -> Iterator[Page]:
+	"""Yield pages in crawl order as they arrive.
+
+	With concurrency > 1 pages are fetched by `iter_pages_async` over one
+	keep-alive client, so only a bounded buffer of HTML is held in memory.
+	"""
+	if concurrency < 1:
+		raise ValueError("concurrency must be at least 1")
+	base, urls, _ = site_pages(site, pages)
+	if not can_fetch(base, user_agent, "/"):
+		print("robots.txt disallows fetching", file=sys.stderr)
+		return
+	if concurrency == 1:
+		for page_url in urls:
+			yield fetch(page_url, user_agent, cache)
+		return
+
+	loop = asyncio.new_event_loop()
+	client = make_async_client(user_agent, concurrency)
+	pages_async = iter_pages_async(client, urls, cache, concurrency)
+	try:
+		while True:
+			try:
+				yield loop.run_until_complete(anext(pages_async))
+			except StopAsyncIteration:
+				return
+	finally:
+		loop.run_until_complete(pages_async.aclose())
+		loop.run_until_complete(client.aclose())
+		loop.close()
+
+
+def iter_items(
+	site: str,
+	pages: int,
+	user_agent: str,
+	concurrency: int = 1,
+	parser: str | None = None,
+	cache: ResponseCache | None = None,
+) -> Iterator[ScrapedResourceCreate]:
+	"""Parse pages as they arrive and yield their items one by one.
+
+	Pages answered with 304 Not Modified reuse the cached items instead of
+	being parsed again.
+	"""
+	_, _, parse = site_pages(site, pages)
+	for page in iter_pages(site, pages, user_agent, concurrency, cache):
+		items = cache.items(page.url) if cache is not None and page.not_modified else None
+		if items is None:
+			items = parse(page.text, parser)
+			if cache is not None:
+				cache.store_items(page.url, items)
+		yield from items
+
+
 def scrape_site(site: str, pages: int, user_agent: str) -> list[ScrapedResourceCreate]:
+	return list(iter_items(site, pages, user_agent))
+
+
+async def scrape_site_async(
+	site: str,
+	pages: int,
+	user_agent: str,
+	concurrency: int = DEFAULT_CONCURRENCY,
+	client: httpx.AsyncClient | None = None,
+	parser: str | None = None,
+) -> list[ScrapedResourceCreate]:
+	"""Concurrent variant of `scrape_site`; results keep page order."""
+	if concurrency < 1:
+		raise ValueError("concurrency must be at least 1")
 	items: list[ScrapedResourceCreate] = []
-	if site == "books":
-		base = BOOKS_BASE
-		if not can_fetch(base, user_agent, "/"):
-			print("robots.txt disallows fetching", file=sys.stderr)
-			return items
-		url = base
-		for page in range(1, pages + 1):
-			page_url = urljoin(base, f"catalogue/page-{page}.html") if page > 1 else base
-			html = fetch_page(page_url, user_agent)
-			items.extend(parse_books(html))
-	elif site == "quotes":
-		base = QUOTES_BASE
-		if not can_fetch(base, user_agent, "/"):
-			print("robots.txt disallows fetching", file=sys.stderr)
-			return items
-		for page in range(1, pages + 1):
-			page_url = urljoin(base, f"page/{page}/")
-			html = fetch_page(page_url, user_agent)
-			items.extend(parse_quotes(html))
-	else:
-		raise ValueError("Unsupported site. Use 'books' or 'quotes'.")
+	base, urls, parse = site_pages(site, pages)
+	if not await asyncio.to_thread(can_fetch, base, user_agent, "/"):
+		print("robots.txt disallows fetching", file=sys.stderr)
+		return items
+
+	owns_client = client is None
+	if client is None:
+		client = make_async_client(user_agent, concurrency)
+	try:
+		async for page in iter_pages_async(client, urls, concurrency=concurrency):
+			items.extend(parse(page.text, parser))
+	finally:
+		if owns_client:
+			await client.aclose()
 	return items
 
 
-def save_json(items: list[ScrapedResourceCreate], path: Path) -> None:
-	path.parent.mkdir(parents=True, exist_ok=True)
-	with path.open("w", encoding="utf-8") as f:
-		json.dump([i.model_dump() for i in items], f, ensure_ascii=False, indent=2)
+class JsonArrayWriter:
+	"""Write items to a JSON array one at a time.
+
+	Produces the same layout as `json.dump(..., indent=2)` and always closes the
+	array, so an interrupted crawl still leaves a valid file.
+	"""
+
+	def __init__(self, path: Path):
+		self.path = path
+		self.count = 0
+		self._file: TextIO | None = None
+
+	def __enter__(self) -> JsonArrayWriter:
+		self.path.parent.mkdir(parents=True, exist_ok=True)
+		self._file = self.path.open("w", encoding="utf-8")
+		self._file.write("[")
+		return self
+
+	def write(self, item: ScrapedResourceCreate) -> None:
+		assert self._file is not None, "writer is not open"
+		body = json.dumps(item.model_dump(), ensure_ascii=False, indent=2)
+		self._file.write(",\n" if self.count else "\n")
+		self._file.write("\n".join("  " + line for line in body.splitlines()))
+		self.count += 1
 
+	def flush(self) -> None:
+		if self._file is not None:
+			self._file.flush()
 
-def insert_db(items: list[ScrapedResourceCreate]) -> int:
-	init_db()
+	def __exit__(self, *exc_info) -> None:
+		if self._file is None:
+			return
+		self._file.write("\n]" if self.count else "]")
+		self._file.close()
+		self._file = None
+
+
+def save_json(items: Iterable[ScrapedResourceCreate], path: Path) -> None:
+	with JsonArrayWriter(path) as writer:
+		for item in items:
+			writer.write(item)
+
+
+def insert_db(items: list[ScrapedResourceCreate]) -> ScrapedImportResult:
+	ensure_schema()
 	with SessionLocal() as db:  # type: Session
 		from app.crud import insert_scraped_resources
 		return insert_scraped_resources(db, items)
 
 
+def _batched(items: Iterable[ScrapedResourceCreate], size: int) -> Iterator[list[ScrapedResourceCreate]]:
+	iterator = iter(items)
+	while batch := list(islice(iterator, size)):
+		yield batch
+
+
+def run_pipeline(
+	items: Iterable[ScrapedResourceCreate],
+	json_path: Path,
+	batch_size: int = DEFAULT_BATCH_SIZE,
+) -> tuple[int, ScrapedImportResult]:
+	"""Stream items into the JSON file and the database in committed batches.
+
+	Only one batch is held in memory at a time. Every completed batch is
+	committed before the next is pulled, so a failure mid-crawl keeps all
+	earlier batches in both the database and the JSON file.
+	Returns the number of items scraped and the combined upsert counts.
+	"""
+	if batch_size < 1:
+		raise ValueError("batch_size must be at least 1")
+	from app.crud import insert_scraped_resources
+
+	ensure_schema()
+	scraped = 0
+	totals = ScrapedImportResult()
+	with SessionLocal() as db, JsonArrayWriter(json_path) as writer:  # type: Session
+		for batch in _batched(items, batch_size):
+			result = insert_scraped_resources(db, batch)
+			totals.inserted += result.inserted
+			totals.updated += result.updated
+			totals.unchanged += result.unchanged
+			for item in batch:
+				writer.write(item)
+			writer.flush()
+			scraped += len(batch)
+	return scraped, totals
+
+
 def main(argv: list[str] | None = None) -> int:
 	parser = argparse.ArgumentParser(description="Scrape books or quotes and insert into DB")
 	parser.add_argument("--pages", type=int, default=1)
 	parser.add_argument("--site", choices=["books", "quotes"], default="books")
 	parser.add_argument("--db", default=".", help="Database URL or '.' to use env DATABASE_URL")
 	parser.add_argument("--json", default="samples/scraped.json")
+	parser.add_argument(
+		"--concurrency",
+		type=int,
+		default=1,
+		help="Number of pages fetched in parallel (1 keeps the sequential crawl)",
+	)
+	parser.add_argument(
+		"--batch-size",
+		type=int,
+		default=DEFAULT_BATCH_SIZE,
+		help="Items per database commit",
+	)
+	parser.add_argument(
+		"--parser",
+		choices=sorted(PARSER_BACKENDS),
+		default=DEFAULT_PARSER,
+		help="HTML parser backend (defaults to the fastest installed)",
+	)
+	parser.add_argument(
+		"--cache-dir",
+		default=DEFAULT_CACHE_DIR,
+		help="Directory for the HTTP response cache",
+	)
+	parser.add_argument("--no-cache", action="store_true", help="Disable the HTTP response cache")
 	args = parser.parse_args(argv)
 
 	settings = get_settings()
@@ -149,12 +620,21 @@ def main(argv: list[str] | None = None) -> int:
 
 	if args.db != ".":
 		# Override DATABASE_URL dynamically
-		settings.DATABASE_URL = args.db  # type: ignore[attr-defined]
+		override_settings(DATABASE_URL=args.db)
+		reset_engine()
+
+	if args.concurrency < 1:
+		parser.error("--concurrency must be at least 1")
+	if args.batch_size < 1:
+		parser.error("--batch-size must be at least 1")
 
-	items = scrape_site(args.site, args.pages, user_agent)
-	save_json(items, Path(args.json))
-	inserted = insert_db(items)
-	print(f"Scraped: {len(items)}, Inserted: {inserted}, JSON: {args.json}")
+	cache = None if args.no_cache else ResponseCache(args.cache_dir)
+	items = iter_items(args.site, args.pages, user_agent, args.concurrency, args.parser, cache)
+	scraped, result = run_pipeline(items, Path(args.json), args.batch_size)
+	print(
+		f"Scraped: {scraped}, Inserted: {result.inserted}, Updated: {result.updated}, "
+		f"Unchanged: {result.unchanged}, JSON: {args.json}"
+	)
 	return 0
 
 
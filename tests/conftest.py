@@ -1,7 +1,43 @@
 import os
 import sys
+import tempfile
+from contextlib import contextmanager
+
+import pytest
 
 # Ensure the repository root is on sys.path so tests can import project modules
 PROJECT_ROOT = os.path.dirname(os.path.abspath(os.path.join(__file__, os.pardir)))
 if PROJECT_ROOT not in sys.path:
-    sys.path.insert(0, PROJECT_ROOT)
\ No newline at end of file
+    sys.path.insert(0, PROJECT_ROOT)
+
+from app.config import override_settings  # noqa: E402
+from app.db import capture_queries  # noqa: E402
+
+# Run against a throwaway SQLite file instead of the checked-in sms.db; the
+# engine is built lazily, so this takes effect before any test connects.
+TEST_DB_DIR = tempfile.mkdtemp(prefix="sms-tests-")
+override_settings(DATABASE_URL="sqlite:///" + os.path.join(TEST_DB_DIR, "test.db"))
+
+
+@pytest.fixture
+def max_queries():
+    """Context manager failing the test if its block runs more than `limit` statements.
+
+    Identical statements run `n_plus_one` times or more are reported as a
+    suspected N+1; pass `n_plus_one=None` where repeats are expected.
+
+        with max_queries(2):
+            client.get("/courses/overview")
+    """
+
+    @contextmanager
+    def check(limit, n_plus_one=3):
+        with capture_queries() as log:
+            yield log
+        statements = "\n".join(log.statements)
+        assert log.count <= limit, f"{log.count} queries, expected at most {limit}:\n{statements}"
+        if n_plus_one is not None:
+            repeated = log.repeated(n_plus_one)
+            assert not repeated, f"Suspected N+1, repeated statements: {repeated}"
+
+    return check
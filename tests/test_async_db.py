@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app import crud_async
+from app.config import get_settings, override_settings
+from app.db import (
+	AsyncSessionLocal,
+	async_database_url,
+	capture_queries,
+	ensure_schema,
+	get_async_engine,
+	reset_engine,
+)
+from app.main import use_async_routes
+
+
+def test_async_database_url_swaps_driver():
+	assert async_database_url("sqlite:///./sms.db") == "sqlite+aiosqlite:///./sms.db"
+	assert async_database_url("postgresql+psycopg2://u:p@h:5432/sms") == "postgresql+asyncpg://u:p@h:5432/sms"
+	assert async_database_url("mysql+pymysql://u:p@h/sms") == "mysql+aiomysql://u:p@h/sms"
+
+
+@pytest.fixture
+def async_database(tmp_path):
+	"""ASYNC_DATABASE enabled on a fresh file database, through the app's own engine factory."""
+	pytest.importorskip("aiosqlite")  # optional, see requirements-async.txt
+	original = get_settings()
+	override_settings(ASYNC_DATABASE=True, DATABASE_URL=f"sqlite:///{tmp_path / 'async.db'}")
+	reset_engine()
+	ensure_schema()
+	try:
+		yield get_async_engine()
+	finally:
+		asyncio.run(get_async_engine().dispose())
+		override_settings(ASYNC_DATABASE=original.ASYNC_DATABASE, DATABASE_URL=original.DATABASE_URL)
+		reset_engine()
+
+
+def test_async_engine_gets_pragmas_and_instrumentation(async_database):
+	async def pragma():
+		async with AsyncSessionLocal() as db:
+			return (await db.execute(text("PRAGMA foreign_keys"))).scalar_one()
+
+	with capture_queries() as log:
+		assert asyncio.run(pragma()) == 1
+	assert log.statements == ["PRAGMA foreign_keys"]
+
+
+def test_async_routes_share_business_rules(async_database):
+	app = FastAPI()
+	use_async_routes(app)
+	client = TestClient(app)
+
+	student = client.post("/students", json={"first_name": "Ada", "last_name": "L"}).json()
+	course = client.post("/courses", json={"title": "Async 101", "capacity": 1}).json()
+	payload = {"student_id": student["id"], "course_id": course["id"]}
+	assert client.post("/enrollments", json=payload).status_code == 200
+	dup = client.post("/enrollments", json=payload)
+	assert dup.status_code == 400
+	assert "already" in dup.json()["detail"].lower()
+
+	orphan = client.post("/courses", json={"title": "Async 102", "capacity": 1, "teacher_id": 10**9})
+	assert (orphan.status_code, orphan.json()["detail"]) == (400, "Teacher not found")
+
+	other = client.post("/students", json={"first_name": "Bob", "last_name": "B"}).json()
+	full = client.post("/enrollments", json={"student_id": other["id"], "course_id": course["id"]})
+	assert "capacity" in full.json()["detail"].lower()
+
+	resp = client.get("/students", params={"limit": 1})
+	assert [s["id"] for s in resp.json()] == [student["id"]]
+	assert "X-Next-Cursor" in resp.headers
+
+	async def count_courses():
+		async with AsyncSessionLocal() as db:
+			return len(await crud_async.list_courses(db))
+
+	assert asyncio.run(count_courses()) == 1
+	assert client.delete(f"/courses/{course['id']}").status_code == 200
+	assert asyncio.run(count_courses()) == 0
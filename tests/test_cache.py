@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+
+from app import crud, schemas
+from app.cache import EntityCache, LRUCache, get_entity_cache
+from app.db import SessionLocal, init_db
+from app.main import app
+from app.models import Course
+
+
+client = TestClient(app)
+
+
+def setup_module():
+	init_db()
+
+
+def test_lru_cache_evicts_and_expires():
+	cache = LRUCache(maxsize=2, ttl=60)
+	cache.set("a", {"v": 1})
+	cache.set("b", {"v": 2})
+	cache.get("a")
+	cache.set("c", {"v": 3})
+	assert cache.get("b") is None  # least recently used
+	assert cache.get("a") == {"v": 1}
+
+	expiring = LRUCache(ttl=-1)
+	expiring.set("a", {"v": 1})
+	assert expiring.get("a") is None
+
+
+def test_get_course_is_served_from_cache_and_invalidated():
+	cache = get_entity_cache()
+	course_id = client.post("/courses", json={"title": "Cached", "capacity": 2}).json()["id"]
+	student_id = client.post("/students", json={"first_name": "C", "last_name": "S"}).json()["id"]
+
+	before = cache.stats()
+	assert client.get(f"/courses/{course_id}").status_code == 200
+	assert client.get(f"/courses/{course_id}").json()["title"] == "Cached"
+	after = cache.stats()
+	assert after["misses"] == before["misses"] + 1
+	assert after["hits"] == before["hits"] + 1
+	assert client.get("/cache/stats").json()["hits"] == after["hits"]
+
+	# enrolled_count is never cached, so admissions are visible on a cache hit
+	client.post("/enrollments", json={"student_id": student_id, "course_id": course_id})
+	with SessionLocal() as db:
+		assert crud.get_course(db, course_id).enrolled_count == 1
+
+	assert client.delete(f"/courses/{course_id}").status_code == 200
+	assert client.get(f"/courses/{course_id}").status_code == 404
+
+
+def test_cache_hit_is_a_usable_session_object():
+	cache = EntityCache(LRUCache())
+	with SessionLocal() as db:
+		teacher = crud.create_teacher(db, schemas.TeacherCreate(first_name="T", last_name="One"))
+		course = crud.create_course(db, schemas.CourseCreate(title="Merged", teacher_id=teacher.id))
+		course_id = course.id
+	with SessionLocal() as db:
+		cache.get(db, Course, course_id)
+	with SessionLocal() as db:
+		cached = cache.get(db, Course, course_id)
+		assert cache.hits == 1
+		assert cached in db
+		assert cached.teacher.full_name == "T One"
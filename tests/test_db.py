@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import sqlite3
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import inspect, text
+
+from app import crud, schemas
+from app.config import get_settings, override_settings
+from app.models import Course
+from app.db import (
+	SchemaDriftError,
+	SessionLocal,
+	_schema_lock,
+	_stored_fingerprint,
+	ensure_schema,
+	get_engine,
+	init_db,
+	reset_engine,
+	schema_drift,
+)
+
+
+def test_sqlite_connections_get_performance_pragmas():
+	settings = get_settings()
+	with get_engine().connect() as conn:
+		assert conn.execute(text("PRAGMA journal_mode")).scalar_one().upper() == settings.SQLITE_JOURNAL_MODE
+		assert conn.execute(text("PRAGMA synchronous")).scalar_one() == 1  # NORMAL
+		assert conn.execute(text("PRAGMA busy_timeout")).scalar_one() == settings.SQLITE_BUSY_TIMEOUT_MS
+		assert conn.execute(text("PRAGMA cache_size")).scalar_one() == settings.SQLITE_CACHE_SIZE
+		assert conn.execute(text("PRAGMA foreign_keys")).scalar_one() == 1
+
+
+def test_pool_is_sized_from_settings():
+	settings = get_settings()
+	assert get_engine().pool.size() == settings.DB_POOL_SIZE
+
+
+def test_ensure_schema_is_fast_and_non_destructive():
+	init_db()
+	assert ensure_schema() is False  # reset stored the fingerprint
+
+	with SessionLocal() as db:
+		student = crud.create_student(db, schemas.StudentCreate(first_name="Keep", last_name="Me"))
+		student_id = student.id
+
+	# Simulate an older deployment: one table missing and no fingerprint yet
+	with get_engine().begin() as conn:
+		conn.execute(text("DROP TABLE scraped_resources"))
+		conn.execute(text("DELETE FROM schema_meta"))
+	assert ensure_schema() is True
+	assert ensure_schema() is False
+
+	assert "scraped_resources" in inspect(get_engine()).get_table_names()
+	with SessionLocal() as db:
+		assert crud.get_student(db, student_id) is not None
+
+
+# Tables as an early release created them, before price normalisation,
+# seat counters and the (source, url) upsert key
+OLD_SCHEMA = [
+	"CREATE TABLE students (id INTEGER NOT NULL PRIMARY KEY, first_name VARCHAR(100) NOT NULL, "
+	"last_name VARCHAR(100) NOT NULL, created_at DATETIME NOT NULL)",
+	"CREATE TABLE teachers (id INTEGER NOT NULL PRIMARY KEY, first_name VARCHAR(100) NOT NULL, "
+	"last_name VARCHAR(100) NOT NULL, created_at DATETIME NOT NULL)",
+	"CREATE TABLE courses (id INTEGER NOT NULL PRIMARY KEY, title VARCHAR(200) NOT NULL, "
+	"capacity INTEGER NOT NULL, teacher_id INTEGER REFERENCES teachers (id))",
+	"CREATE UNIQUE INDEX ix_courses_title ON courses (title)",
+	"CREATE TABLE enrollments (id INTEGER NOT NULL PRIMARY KEY, student_id INTEGER NOT NULL "
+	"REFERENCES students (id), course_id INTEGER NOT NULL REFERENCES courses (id), "
+	"created_at DATETIME NOT NULL, CONSTRAINT uq_student_course UNIQUE (student_id, course_id))",
+	"CREATE TABLE scraped_resources (id INTEGER NOT NULL PRIMARY KEY, source VARCHAR(50) NOT NULL, "
+	"title VARCHAR(300) NOT NULL, url VARCHAR(500) NOT NULL, category_or_author VARCHAR(200) NOT NULL, "
+	"price VARCHAR(50), created_at DATETIME NOT NULL)",
+	"INSERT INTO scraped_resources VALUES (1, 'books', 'Old', '/old', 'Travel', '£12.50', '2020-01-01')",
+	"INSERT INTO students VALUES (1, 'Old', 'Student', '2020-01-01'), (2, 'Other', 'Student', '2020-01-01'), "
+	"(3, 'New', 'Student', '2020-01-01')",
+	"INSERT INTO courses VALUES (1, 'Old 101', 2, NULL), (2, 'Old 102', 2, NULL)",
+	"INSERT INTO enrollments VALUES (1, 1, 1, '2020-01-01'), (2, 2, 1, '2020-01-01'), (3, 1, 2, '2020-01-01')",
+]
+
+
+@contextmanager
+def database(url: str):
+	original = get_settings().DATABASE_URL
+	try:
+		override_settings(DATABASE_URL=url)
+		reset_engine()
+		yield get_engine()
+	finally:
+		override_settings(DATABASE_URL=original)
+		reset_engine()
+
+
+def test_ensure_schema_upgrades_old_tables_in_place(tmp_path):
+	with database(f"sqlite:///{tmp_path / 'old.db'}") as engine:
+		with engine.begin() as conn:
+			for statement in OLD_SCHEMA:
+				conn.exec_driver_sql(statement)
+			assert "foreign key enrollments(student_id) -> students ON DELETE CASCADE" in schema_drift(conn)
+		assert ensure_schema() is True
+		with engine.connect() as conn:
+			assert schema_drift(conn) == []
+			# Rebuilt with the models' foreign keys, rows and indexes intact
+			cascades = {fk["options"].get("ondelete") for fk in inspect(conn).get_foreign_keys("enrollments")}
+			assert cascades == {"CASCADE"}
+			assert conn.exec_driver_sql("SELECT COUNT(*) FROM enrollments").scalar_one() == 3
+			assert conn.exec_driver_sql("PRAGMA foreign_keys").scalar_one() == 1
+		assert ensure_schema() is False
+
+		with SessionLocal() as db:
+			old = crud.list_scraped(db, 0, 10, None, min_amount=1250, max_amount=1250)
+			assert [(r.price_amount, r.currency) for r in old] == [(1250, "GBP")]
+			# The upsert relies on the unique key added in place
+			result = crud.insert_scraped_resources(
+				db, [schemas.ScrapedResourceCreate(source="books", title="New", url="/old", category_or_author="Travel")]
+			)
+			assert result.updated == 1
+
+			# Seat counters reflect existing enrollments, so full courses stay full
+			assert [db.get(Course, c).enrolled_count for c in (1, 2)] == [2, 1]
+			with pytest.raises(ValueError, match="capacity reached"):
+				crud.create_enrollment(db, schemas.EnrollmentCreate(student_id=3, course_id=1))
+
+
+def test_deletes_cascade_after_upgrading_old_tables(tmp_path):
+	with database(f"sqlite:///{tmp_path / 'old.db'}") as engine:
+		with engine.begin() as conn:
+			for statement in OLD_SCHEMA:
+				conn.exec_driver_sql(statement)
+			conn.exec_driver_sql("INSERT INTO teachers VALUES (1, 'Old', 'Teacher', '2020-01-01')")
+			conn.exec_driver_sql("UPDATE courses SET teacher_id = 1 WHERE id = 2")
+		ensure_schema()
+
+		with SessionLocal() as db:
+			# Student 1 is enrolled in both courses; course 2 belongs to teacher 1
+			assert crud.delete_student(db, 1) is True
+			assert db.get(Course, 1).enrolled_count == 1
+			assert crud.delete_teacher(db, 1) is True
+			assert db.get(Course, 2) is None
+			assert db.execute(text("SELECT student_id, course_id FROM enrollments")).all() == [(2, 1)]
+
+
+def test_ensure_schema_reports_columns_it_cannot_add(tmp_path):
+	with database(f"sqlite:///{tmp_path / 'drifted.db'}") as engine:
+		with engine.begin() as conn:
+			# category_or_author is NOT NULL without a default and indexed
+			conn.exec_driver_sql(
+				"CREATE TABLE scraped_resources (id INTEGER NOT NULL PRIMARY KEY, source VARCHAR(50) NOT NULL, "
+				"title VARCHAR(300) NOT NULL, url VARCHAR(500) NOT NULL, created_at DATETIME NOT NULL)"
+			)
+		for _ in range(2):
+			with pytest.raises(SchemaDriftError, match="scraped_resources.category_or_author.*init --reset"):
+				ensure_schema()
+
+
+def test_schema_lock_is_kept_while_reading_the_fingerprint(tmp_path):
+	with database(f"sqlite:///{tmp_path / 'fresh.db'}") as engine:
+		with _schema_lock(engine) as conn:
+			assert _stored_fingerprint(conn) is None
+			# Another worker cannot take the write lock meanwhile
+			other = sqlite3.connect(tmp_path / "fresh.db", timeout=0)
+			with pytest.raises(sqlite3.OperationalError, match="locked"):
+				other.execute("BEGIN IMMEDIATE")
+			other.close()
+
+
+def test_settings_are_cached_and_engine_follows_overrides(tmp_path):
+	assert get_settings() is get_settings()
+	original = get_settings().DATABASE_URL
+	other = f"sqlite:///{tmp_path / 'other.db'}"
+	try:
+		override_settings(DATABASE_URL=other)
+		reset_engine()
+		assert str(get_engine().url) == other
+		ensure_schema()
+		assert "students" in inspect(get_engine()).get_table_names()
+	finally:
+		override_settings(DATABASE_URL=original)
+		reset_engine()
+	assert str(get_engine().url) == original
+
+
+def test_slow_queries_are_logged_with_plan(caplog):
+	original = get_settings().SLOW_QUERY_MS
+	override_settings(SLOW_QUERY_MS=0)
+	try:
+		with caplog.at_level("WARNING", logger="app.db.slow_query"):
+			with SessionLocal() as db:
+				db.execute(text("SELECT id FROM students WHERE id = :id"), {"id": 1}).all()
+	finally:
+		override_settings(SLOW_QUERY_MS=original)
+	record = next(r for r in caplog.records if "FROM students" in r.getMessage())
+	message = record.getMessage()
+	assert "Parameters: (1,)" in message
+	assert "Plan:" in message and "students" in message.split("Plan:")[1]
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import json
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import func, select
 
 from app.main import app
-from app.db import init_db
+from app.db import SessionLocal, init_db
+from app import crud, schemas
+from app.models import Course, Enrollment
 
 
 client = TestClient(app)
@@ -50,4 +56,253 @@ def test_enrollment_rules_duplicate_and_capacity():
 	# Capacity reached for second student
 	resp_cap = client.post("/enrollments", json={"student_id": student_b, "course_id": course_id})
 	assert resp_cap.status_code == 400
-	assert "capacity" in resp_cap.json()["detail"].lower()
\ No newline at end of file
+	assert "capacity" in resp_cap.json()["detail"].lower()
+
+
+def test_list_students_keyset_pagination():
+	ids = [create_student(f"Page{n}", "P") for n in range(5)]
+	seen = []
+	resp = client.get("/students", params={"limit": 2})
+	while True:
+		assert resp.status_code == 200
+		seen.extend(s["id"] for s in resp.json())
+		cursor = resp.headers.get("X-Next-Cursor")
+		if cursor is None:
+			break
+		resp = client.get("/students", params={"limit": 2, "after": cursor})
+	assert seen == sorted(seen)
+	assert set(ids) <= set(seen)
+	assert len(seen) == len(set(seen))
+
+	# skip keeps working and follows the same ordering
+	resp = client.get("/students", params={"skip": 1, "limit": 2})
+	assert [s["id"] for s in resp.json()] == seen[1:3]
+
+	assert client.get("/students", params={"after": "not-a-cursor"}).status_code == 400
+
+
+def test_concurrent_enrollment_never_overfills_course():
+	capacity = 5
+	course_id = create_course(title="Registration Day", capacity=capacity)
+	students = [create_student(f"Rush{n}", "R") for n in range(40)]
+
+	def enroll(student_id):
+		with SessionLocal() as db:
+			try:
+				crud.create_enrollment(db, schemas.EnrollmentCreate(student_id=student_id, course_id=course_id))
+				return "ok"
+			except ValueError as e:
+				return str(e)
+
+	with ThreadPoolExecutor(max_workers=16) as pool:
+		outcomes = list(pool.map(enroll, students))
+
+	assert outcomes.count("ok") == capacity
+	assert set(outcomes) == {"ok", "Course capacity reached"}
+	with SessionLocal() as db:
+		course = db.get(Course, course_id)
+		assert course.enrolled_count == capacity
+		taken = db.execute(
+			select(func.count(Enrollment.id)).where(Enrollment.course_id == course_id)
+		).scalar_one()
+		assert taken == capacity
+
+
+def test_deleting_enrollment_releases_seat():
+	course_id = create_course(title="Seat Release", capacity=1)
+	student_a = create_student("Seat", "A")
+	student_b = create_student("Seat", "B")
+	enrollment = client.post("/enrollments", json={"student_id": student_a, "course_id": course_id}).json()
+	assert client.post("/enrollments", json={"student_id": student_b, "course_id": course_id}).status_code == 400
+
+	assert client.delete(f"/enrollments/{enrollment['id']}").status_code == 200
+	assert client.post("/enrollments", json={"student_id": student_b, "course_id": course_id}).status_code == 200
+
+	# Deleting the student frees the seat as well
+	assert client.delete(f"/students/{student_b}").status_code == 200
+	assert client.post("/enrollments", json={"student_id": student_a, "course_id": course_id}).status_code == 200
+
+
+def test_bulk_enrollment_reports_per_item_reasons():
+	course_id = create_course(title="Cohort", capacity=3)
+	students = [create_student(f"Cohort{n}", "C") for n in range(4)]
+	assert client.post("/enrollments", json={"student_id": students[0], "course_id": course_id}).status_code == 200
+
+	payload = [{"student_id": s, "course_id": course_id} for s in students]
+	payload += [
+		{"student_id": students[1], "course_id": course_id},  # duplicate within the batch
+		{"student_id": students[1], "course_id": 999_999},
+	]
+	resp = client.post("/enrollments/bulk", json=payload)
+	assert resp.status_code == 200
+	body = resp.json()
+	assert body["accepted"] == 2
+	assert body["rejected"] == 4
+	reasons = [r["reason"] for r in body["results"]]
+	assert reasons == [
+		"Student already enrolled in this course",
+		None,
+		None,
+		"Course capacity reached",
+		"Student already enrolled in this course",
+		"Course not found",
+	]
+	assert all(r["enrollment_id"] for r in body["results"] if r["accepted"])
+
+	listed = client.get("/enrollments", params={"limit": 1000}).json()
+	in_course = {e["student_id"] for e in listed if e["course_id"] == course_id}
+	assert in_course == set(students[:3])
+	with SessionLocal() as db:
+		assert db.get(Course, course_id).enrolled_count == 3
+
+
+def test_bulk_enrollment_query_budget(max_queries):
+	course_id = create_course(title="Lecture hall", capacity=300)
+	people = [{"first_name": f"Hall{n}", "last_name": "H"} for n in range(300)]
+	students = [s["id"] for s in client.post("/students/bulk", json=people).json()]
+	# Course, student and existing-pair lookups, one seat UPDATE, one INSERT ... RETURNING
+	with max_queries(5):
+		resp = client.post("/enrollments/bulk", json=[{"student_id": s, "course_id": course_id} for s in students])
+	assert resp.json()["accepted"] == 300
+	listed = {
+		e["id"]: e["student_id"]
+		for e in client.get("/enrollments", params={"limit": 10_000}).json()
+		if e["course_id"] == course_id
+	}
+	assert {r["enrollment_id"]: r["student_id"] for r in resp.json()["results"]} == listed
+
+
+def test_course_overview_embeds_teacher_and_seats():
+	teacher_id = create_teacher("Grace", "Hopper")
+	course_id = create_course(title="Compilers", capacity=3, teacher_id=teacher_id)
+	untaught_id = create_course(title="Self Study", capacity=2)
+	student_id = create_student("Over", "View")
+	client.post("/enrollments", json={"student_id": student_id, "course_id": course_id})
+
+	resp = client.get("/courses/overview", params={"limit": 1000})
+	assert resp.status_code == 200
+	by_id = {c["id"]: c for c in resp.json()}
+	assert by_id[course_id]["teacher_full_name"] == "Grace Hopper"
+	assert by_id[course_id]["enrolled_count"] == 1
+	assert by_id[course_id]["seats_remaining"] == 2
+	assert by_id[untaught_id]["teacher_full_name"] is None
+	assert by_id[untaught_id]["seats_remaining"] == 2
+
+	first = client.get("/courses/overview", params={"limit": 1})
+	cursor = first.headers["X-Next-Cursor"]
+	second = client.get("/courses/overview", params={"limit": 1, "after": cursor})
+	assert second.json()[0]["id"] > first.json()[0]["id"]
+
+
+def test_list_endpoints_encode_like_response_model():
+	create_student("Zoë", "Ünïcode")
+	resp = client.get("/students", params={"limit": 1000})
+	assert resp.headers["content-type"] == "application/json"
+	with SessionLocal() as db:
+		objs = crud.list_students(db, 0, 1000)
+	expected = [schemas.StudentRead.model_validate(o).model_dump(mode="json") for o in objs]
+	# Byte-identical to FastAPI's JSONResponse rendering of the response_model
+	assert resp.content == json.dumps(expected, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def test_query_budgets(max_queries):
+	teacher_id = create_teacher("Budget", "Keeper")
+	course_ids = [create_course(title=f"Budget {n}", capacity=5, teacher_id=teacher_id) for n in range(3)]
+	student_id = create_student("Budget", "Student")
+
+	with max_queries(2):
+		assert client.get("/courses/overview", params={"limit": 1000}).status_code == 200
+	with max_queries(2):
+		resp = client.post("/enrollments", json={"student_id": student_id, "course_id": course_ids[0]})
+		assert resp.status_code == 200
+	with max_queries(1):
+		client.get("/enrollments", params={"limit": 1000})
+
+
+def test_max_queries_flags_n_plus_one(max_queries):
+	teacher_id = create_teacher("Lazy", "Loader")
+	for n in range(3):
+		create_course(title=f"Lazy {n}", teacher_id=teacher_id)
+	# Refreshing expired rows one by one issues an identical SELECT per course
+	with pytest.raises(AssertionError, match="Suspected N\\+1"):
+		with max_queries(100):
+			with SessionLocal() as db:
+				courses = db.execute(select(Course).where(Course.title.like("Lazy %"))).scalars().all()
+				db.expire_all()
+				[(c.title, c.teacher_id) for c in courses]
+
+
+def test_deletes_cascade_in_the_database(max_queries):
+	teacher_id = create_teacher("Cascade", "Teacher")
+	course_id = create_course(title="Cascade 101", capacity=50, teacher_id=teacher_id)
+	other_id = create_course(title="Cascade 102", capacity=50)
+	students = [create_student(f"C{n}", "S") for n in range(20)]
+	result = client.post(
+		"/enrollments/bulk",
+		json=[{"student_id": s, "course_id": c} for s in students for c in (course_id, other_id)],
+	).json()
+	assert result["accepted"] == 40
+
+	def enrollments(course: int) -> int:
+		with SessionLocal() as db:
+			return db.execute(
+				select(func.count(Enrollment.id)).where(Enrollment.course_id == course)
+			).scalar_one()
+
+	# Bulk removal frees every seat of the course
+	with max_queries(2):
+		resp = client.request("DELETE", "/enrollments", params={"course_id": other_id})
+	assert resp.json() == {"deleted": 20}
+	assert enrollments(other_id) == 0
+	with SessionLocal() as db:
+		assert db.get(Course, other_id).enrolled_count == 0
+	assert client.request("DELETE", "/enrollments", params={"course_id": 10**9}).status_code == 404
+
+	# Deleting the teacher removes the course and its enrollments without loading them
+	with max_queries(2):
+		assert client.delete(f"/teachers/{teacher_id}").status_code == 200
+	assert client.get(f"/courses/{course_id}").status_code == 404
+	assert enrollments(course_id) == 0
+	assert client.delete(f"/teachers/{teacher_id}").status_code == 404
+
+
+def test_course_with_unknown_teacher_is_rejected():
+	resp = client.post("/courses", json={"title": "Orphan 101", "capacity": 5, "teacher_id": 10**9})
+	assert resp.status_code == 400
+	assert resp.json()["detail"] == "Teacher not found"
+	assert create_course(title="Orphan 101", teacher_id=create_teacher("Real", "Teacher"))
+
+
+def test_bulk_people_json_and_ndjson(max_queries):
+	people = [{"first_name": f"Bulk{n}", "last_name": "Student"} for n in range(25)]
+	# One INSERT ... RETURNING per chunk, no per-row refresh
+	with max_queries(3, n_plus_one=None):
+		resp = client.post("/students/bulk", params={"chunk_size": 10}, json=people)
+	assert resp.status_code == 200
+	created = resp.json()
+	assert [p["first_name"] for p in created] == [p["first_name"] for p in people]
+	assert [p["id"] for p in created] == sorted(p["id"] for p in created)
+	assert client.get(f"/students/{created[-1]['id']}").json() == created[-1]
+
+	body = "\n".join(json.dumps({"first_name": f"T{n}", "last_name": "Bulk"}) for n in range(3))
+	resp = client.post("/teachers/bulk", content=body, headers={"Content-Type": "application/x-ndjson"})
+	assert [t["first_name"] for t in resp.json()] == ["T0", "T1", "T2"]
+	assert set(resp.json()[0]) == {"id", "first_name", "last_name", "created_at"}
+
+
+def test_bulk_people_are_all_or_nothing(max_queries):
+	with SessionLocal() as db:
+		before = len(crud.list_teachers(db, 0, 10_000))
+	body = json.dumps({"first_name": "Good", "last_name": "Line"}) + "\n" + json.dumps({"first_name": "Bad"})
+	# On SQLite the body is validated before the first INSERT takes the write lock
+	with max_queries(0):
+		resp = client.post(
+			"/teachers/bulk",
+			params={"chunk_size": 1},
+			content=body,
+			headers={"Content-Type": "application/x-ndjson"},
+		)
+	assert resp.status_code == 422
+	assert resp.json()["detail"]["line"] == 2
+	with SessionLocal() as db:
+		assert len(crud.list_teachers(db, 0, 10_000)) == before
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+
+from fastapi.testclient import TestClient
+
+from app import export
+from app.db import init_db
+from app.main import app
+
+
+client = TestClient(app)
+
+
+def setup_module():
+	init_db()
+
+
+def test_export_enrollments_filtered_csv_and_ndjson(monkeypatch):
+	# Small batches so the stream spans several fetches
+	monkeypatch.setattr(export, "EXPORT_BATCH_SIZE", 2)
+	course_id = client.post("/courses", json={"title": "Export 101", "capacity": 10}).json()["id"]
+	other_id = client.post("/courses", json={"title": "Export 102", "capacity": 10}).json()["id"]
+	students = [
+		client.post("/students", json={"first_name": f"S{n}", "last_name": "X"}).json()["id"]
+		for n in range(5)
+	]
+	for student_id in students:
+		client.post("/enrollments", json={"student_id": student_id, "course_id": course_id})
+	client.post("/enrollments", json={"student_id": students[0], "course_id": other_id})
+
+	resp = client.get(f"/export/enrollments?format=csv&course_id={course_id}&columns=student_id,course_id")
+	assert resp.status_code == 200
+	assert resp.headers["content-type"].startswith("text/csv")
+	rows = list(csv.reader(io.StringIO(resp.text)))
+	assert rows[0] == ["student_id", "course_id"]
+	assert rows[1:] == [[str(s), str(course_id)] for s in students]
+
+	resp = client.get(f"/export/enrollments?format=ndjson&course_id={course_id}")
+	lines = [json.loads(line) for line in resp.text.splitlines()]
+	assert [line["student_id"] for line in lines] == students
+	assert set(lines[0]) == {"id", "student_id", "course_id", "created_at"}
+
+
+def test_export_rejects_unknown_entity_column_and_filter():
+	assert client.get("/export/nope").status_code == 404
+	assert client.get("/export/students?columns=id,password").status_code == 400
+	assert client.get("/export/students?course_id=1").status_code == 400
+	assert client.get("/export/students?format=xml").status_code == 422
+
+
+def test_export_empty_table_still_has_csv_header():
+	resp = client.get("/export/scraped?source=none")
+	assert resp.text.splitlines() == ["source,title,url,category_or_author,price,price_amount,currency,id,created_at"]
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import re
+
+from fastapi.testclient import TestClient
+
+from app.db import init_db
+from app.main import app
+from app.metrics import metrics
+
+
+client = TestClient(app)
+
+
+def setup_module():
+	init_db()
+	metrics.reset()
+
+
+def server_timing(resp) -> tuple[float, int]:
+	match = re.search(r'db;dur=([\d.]+);desc="(\d+) queries"', resp.headers["server-timing"])
+	assert match, resp.headers["server-timing"]
+	return float(match.group(1)), int(match.group(2))
+
+
+def test_server_timing_counts_queries_per_request():
+	course_id = client.post("/courses", json={"title": "Metrics 101", "capacity": 5}).json()["id"]
+	student_id = client.post("/students", json={"first_name": "M", "last_name": "T"}).json()["id"]
+
+	resp = client.post("/enrollments", json={"student_id": student_id, "course_id": course_id})
+	assert resp.status_code == 200
+	_, queries = server_timing(resp)
+	# Seat claim UPDATE and enrollment INSERT
+	assert queries == 2
+
+	resp = client.get("/cache/stats")
+	assert server_timing(resp)[1] == 0
+
+
+def test_metrics_endpoint_exposes_route_templates():
+	client.get("/students/1")
+	client.get("/students/2")
+	client.get("/no/such/path")
+	body = client.get("/metrics").text
+
+	labels = 'method="GET",route="/students/{student_id}"'
+	assert f"sms_http_request_duration_seconds_count{{{labels}}} 2" in body
+	assert f'sms_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in body
+	assert f"sms_db_queries_total{{{labels}}}" in body
+	assert 'route="<unmatched>"' in body
+	# The scrape itself is in flight while the metrics are rendered
+	assert 'sms_http_requests_in_flight{method="GET",route="/metrics"} 1' in body
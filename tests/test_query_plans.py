@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import select, text
+
+from app import crud, models, schemas
+from app.db import SessionLocal, full_scans, get_engine
+from app.export import export_statement
+from app.search import search_statement
+from benchmarks.seed import seed
+
+
+def setup_module():
+	seed(students=2000, teachers=50, courses=500, enrollments=5000, capacity=60)
+	with SessionLocal() as db:
+		crud.insert_scraped_resources(
+			db,
+			[
+				schemas.ScrapedResourceCreate(
+					source="books",
+					title=f"Light {n}",
+					url=f"/plan/{n}",
+					category_or_author="Poetry",
+					price=f"£{n % 50}.99",
+				)
+				for n in range(2000)
+			],
+		)
+	with get_engine().begin() as conn:
+		# Plan with real statistics, as a long-running database would
+		conn.execute(text("ANALYZE"))
+
+
+# Statements the CRUD layer issues on hot paths, built by the same functions
+# with representative arguments
+HOT_QUERIES = {
+	"student page (keyset)": lambda: crud.page_query(models.Student, 0, 100, 50),
+	"enrollment page (keyset)": lambda: crud.page_query(models.Enrollment, 0, 100, 50),
+	"list rows (keyset)": lambda: crud.list_rows_query(models.Course, schemas.CourseRead, 0, 100, 10),
+	"enrollment lookup": lambda: crud.enrollment_lookup(schemas.EnrollmentCreate(student_id=1, course_id=1)),
+	"claim seat": lambda: crud.claim_seat(1),
+	"release seat": lambda: crud.release_seat(1),
+	"release student seats": lambda: crud.release_student_seats(1),
+	"enrollments of a course": lambda: crud.course_enrollments_delete(1),
+	"courses of a teacher": lambda: crud.teacher_course_ids(1),
+	"enrollment export by course": lambda: export_statement("enrollments", filters={"course_id": 1}),
+	"course overview (keyset)": lambda: crud.course_overview_query(0, 100, 10),
+	"bulk enrollment lookup": lambda: crud.enrollment_pairs_lookup([(1, 1), (2, 1), (2, 3)]),
+	"scraped upsert lookup": lambda: crud.scraped_keys_lookup([("books", "/plan/1"), ("quotes", "/q/1")]),
+	"scraped price range": lambda: crud.scraped_query(0, 100, None, min_amount=100, max_amount=500),
+	"scraped category price range": lambda: crud.scraped_query(
+		0, 100, 10, source="books", category_or_author="Poetry", currency="GBP", min_amount=100
+	),
+	"scraped stats by source": lambda: crud.scraped_stats_query("books"),
+	"scraped search": lambda: search_statement("sqlite", "light", source="books"),
+}
+
+
+@pytest.mark.parametrize("name", list(HOT_QUERIES))
+def test_hot_query_uses_an_index(name):
+	with SessionLocal() as db:
+		scans = full_scans(db.connection(), HOT_QUERIES[name]())
+	assert not scans, f"{name} falls back to a full scan: {scans}"
+
+
+def test_full_scans_reports_unindexed_filters():
+	with SessionLocal() as db:
+		stmt = select(models.Student.id).where(models.Student.first_name == "First1")
+		assert full_scans(db.connection(), stmt) == ["SCAN students"]
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import json
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+from app import schemas
+from app.db import SessionLocal, init_db
+from app.main import app
+from app.models import ScrapedResource
+
+
+client = TestClient(app)
+
+
+def setup_module():
+	init_db()
+
+
+def scraped_count() -> int:
+	with SessionLocal() as db:
+		return db.execute(select(func.count(ScrapedResource.id))).scalar_one()
+
+
+def counts(resp) -> dict[str, int]:
+	body = resp.json()
+	return {key: body[key] for key in ("inserted", "updated", "unchanged")}
+
+
+def test_import_is_idempotent_upsert():
+	items = [
+		{"source": "books", "title": "Book One", "url": "/b1", "category_or_author": "Travel", "price": "£10.00"},
+		{"source": "books", "title": "Book Two", "url": "/b2", "category_or_author": "Travel", "price": "£12.00"},
+	]
+	resp = client.post("/scraped/import", json=items)
+	assert resp.status_code == 200
+	assert counts(resp) == {"inserted": 2, "updated": 0, "unchanged": 0}
+
+	# Re-import of the same crawl does not duplicate rows
+	resp = client.post("/scraped/import", json=items)
+	assert counts(resp) == {"inserted": 0, "updated": 0, "unchanged": 2}
+	assert scraped_count() == 2
+
+	# Same url under another source is a distinct row; changed price updates in place
+	items[1]["price"] = "£9.99"
+	items.append({**items[0], "source": "quotes"})
+	resp = client.post("/scraped/import", json=items)
+	assert counts(resp) == {"inserted": 1, "updated": 1, "unchanged": 1}
+	assert scraped_count() == 3
+	with SessionLocal() as db:
+		price = db.execute(
+			select(ScrapedResource.price).where(ScrapedResource.url == "/b2")
+		).scalar_one()
+	assert price == "£9.99"
+
+
+def test_import_streams_ndjson_in_chunks():
+	before = scraped_count()
+	lines = (
+		json.dumps({"source": "quotes", "title": f"Q{n}", "url": f"/nd/{n}", "category_or_author": "Anon"})
+		for n in range(2500)
+	)
+	body = ("\n".join(lines) + "\n").encode("utf-8")
+	resp = client.post(
+		"/scraped/import?chunk_size=1000",
+		content=iter([body[:7001], body[7001:]]),  # split mid-line
+		headers={"Content-Type": "application/x-ndjson"},
+	)
+	assert resp.status_code == 200
+	report = resp.json()
+	assert report["rows"] == 2500
+	assert report["inserted"] == 2500
+	assert report["rows_per_second"] > 0
+	assert scraped_count() == before + 2500
+
+
+def test_import_ndjson_reports_invalid_line():
+	body = '{"source": "quotes", "title": "ok", "url": "/bad/1", "category_or_author": "A"}\n{"source": "quotes"}\n'
+	resp = client.post("/scraped/import", content=body, headers={"Content-Type": "application/x-ndjson"})
+	assert resp.status_code == 422
+	assert resp.json()["detail"]["line"] == 2
+
+
+def test_prices_are_normalized_filterable_and_aggregated():
+	items = [
+		{"source": "books", "title": "Cheap", "url": "/p/1", "category_or_author": "Pricing", "price": "Â£5.00"},
+		{"source": "books", "title": "Mid", "url": "/p/2", "category_or_author": "Pricing", "price": "£12.50"},
+		{"source": "books", "title": "Dear", "url": "/p/3", "category_or_author": "Pricing", "price": "£40.00"},
+		{"source": "books", "title": "Other", "url": "/p/4", "category_or_author": "Costing", "price": "£20.00"},
+	]
+	assert client.post("/scraped/import", json=items).status_code == 200
+
+	resp = client.get("/scraped", params={"category_or_author": "Pricing", "min_price": "5", "max_price": "12.50"})
+	assert resp.status_code == 200
+	rows = resp.json()
+	assert [r["title"] for r in rows] == ["Cheap", "Mid"]
+	# Mojibake from a mis-decoded page is repaired
+	assert (rows[0]["price"], rows[0]["price_amount"], rows[0]["currency"]) == ("£5.00", 500, "GBP")
+	assert [r["title"] for r in client.get("/scraped", params={"min_price": "15"}).json()] == ["Dear", "Other"]
+
+	stats = {s["category_or_author"]: s for s in client.get("/scraped/stats", params={"source": "books"}).json()}
+	assert stats["Pricing"] == {
+		"source": "books",
+		"category_or_author": "Pricing",
+		"currency": "GBP",
+		"count": 3,
+		"min_price_amount": 500,
+		"max_price_amount": 4000,
+		"avg_price_amount": 1916.67,
+	}
+	assert stats["Costing"]["count"] == 1
+
+
+def test_read_models_show_stored_prices():
+	# A row stored before prices were normalised keeps NULL amounts until backfilled
+	with SessionLocal() as db:
+		db.add(
+			ScrapedResource(source="books", title="Unparsed relic", url="/relic", category_or_author="Old", price="£9.99")
+		)
+		db.commit()
+	hit = client.get("/scraped/search", params={"q": "relic"}).json()[0]
+	assert (hit["price"], hit["price_amount"], hit["currency"]) == ("£9.99", None, None)
+	assert schemas.ScrapedResourceRead(**{**hit, "price": "£1.00"}).price_amount is None
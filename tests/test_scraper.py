@@ -1,7 +1,23 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+import pytest
+from sqlalchemy import select
+
+import scrape
+from app.db import SessionLocal
+from app.models import ScrapedResource
+from app.schemas import ScrapedResourceCreate
 from scrape import parse_books, parse_quotes
 
+FIXTURES = Path(__file__).parent / "fixtures"
+
 
 def test_parse_books_minimal():
 	html = """
@@ -24,6 +40,7 @@ def test_parse_books_minimal():
 	assert item.title == "Book One"
 	assert item.category_or_author == "Travel"
 	assert item.price == "£51.77"
+	assert (item.price_amount, item.currency) == (5177, "GBP")
 
 
 def test_parse_quotes_minimal():
@@ -43,4 +60,216 @@ def test_parse_quotes_minimal():
 	item = items[0]
 	assert item.source == "quotes"
 	assert item.title.startswith("Be yourself")
-	assert item.category_or_author == "Oscar Wilde"
\ No newline at end of file
+	assert item.category_or_author == "Oscar Wilde"
+
+
+@pytest.mark.parametrize("backend", sorted(scrape.PARSER_BACKENDS))
+def test_parser_backends_match_html_parser(backend):
+	books_html = (FIXTURES / "books_page.html").read_text(encoding="utf-8")
+	quotes_html = (FIXTURES / "quotes_page.html").read_text(encoding="utf-8")
+
+	books = parse_books(books_html, backend)
+	assert len(books) == 20
+	assert books == parse_books(books_html, "html.parser")
+	assert books[0].title == "A Light in the Attic"
+	assert books[0].price == "£51.77"
+	assert {b.category_or_author for b in books} == {"All products"}
+
+	quotes = parse_quotes(quotes_html, backend)
+	assert len(quotes) == 10
+	assert quotes == parse_quotes(quotes_html, "html.parser")
+	assert quotes[1].title.startswith("It is our choices, Harry")
+	assert quotes[1].url == "/author/jk-rowling"
+
+
+def test_unknown_parser_backend():
+	with pytest.raises(ValueError):
+		parse_books("<html></html>", "nope")
+
+
+def test_scrape_site_async_keeps_page_order(monkeypatch):
+	monkeypatch.setattr(scrape, "can_fetch", lambda *args: True)
+	pages = 4
+
+	async def handler(request: httpx.Request) -> httpx.Response:
+		page = int(request.url.path.strip("/").split("/")[-1])
+		# Later pages answer first to prove ordering does not follow completion
+		await asyncio.sleep((pages - page) * 0.01)
+		html = f"""
+		<div class="quote">
+			<span class="text">Quote {page}</span>
+			<small class="author">Author {page}</small>
+		</div>
+		"""
+		return httpx.Response(200, text=html)
+
+	async def run():
+		async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+			return await scrape.scrape_site_async("quotes", pages, "test-agent", concurrency=pages, client=client)
+
+	items = asyncio.run(run())
+	assert [i.title for i in items] == [f"Quote {n}" for n in range(1, pages + 1)]
+	assert [i.category_or_author for i in items] == [f"Author {n}" for n in range(1, pages + 1)]
+
+
+def test_iter_pages_async_slides_past_a_slow_page():
+	events = []
+	in_flight = []
+
+	async def handler(request: httpx.Request) -> httpx.Response:
+		page = int(request.url.path.strip("/").split("/")[-1])
+		events.append(("start", page))
+		in_flight.append(page)
+		assert len(in_flight) <= 2
+		await asyncio.sleep(0.2 if page == 1 else 0.01)
+		in_flight.remove(page)
+		events.append(("end", page))
+		return httpx.Response(200, text=f"page {page}")
+
+	async def run():
+		urls = [f"https://example.test/page/{n}/" for n in range(1, 7)]
+		async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+			return [p.text async for p in scrape.iter_pages_async(client, urls, concurrency=2)]
+
+	assert asyncio.run(run()) == [f"page {n}" for n in range(1, 7)]
+	# The second slot keeps fetching while page 1 is slow, instead of waiting per window
+	assert events.index(("start", 3)) < events.index(("end", 1))
+
+
+def _quote(n: int) -> ScrapedResourceCreate:
+	return ScrapedResourceCreate(
+		source="quotes", title=f"Quote {n}", url=f"/q/{n}", category_or_author="Anon"
+	)
+
+
+def test_save_json_matches_indented_dump(tmp_path):
+	items = [_quote(1), _quote(2)]
+	path = tmp_path / "out.json"
+	scrape.save_json(items, path)
+	expected = json.dumps([i.model_dump() for i in items], ensure_ascii=False, indent=2)
+	assert path.read_text(encoding="utf-8") == expected
+
+	scrape.save_json([], path)
+	assert json.loads(path.read_text(encoding="utf-8")) == []
+
+
+def test_run_pipeline_keeps_committed_batches_on_failure(tmp_path):
+	def crawl():
+		for n in range(1, 6):
+			if n == 5:
+				raise RuntimeError("page fetch failed")
+			yield _quote(n)
+
+	path = tmp_path / "out.json"
+	with pytest.raises(RuntimeError):
+		scrape.run_pipeline(crawl(), path, batch_size=2)
+
+	with SessionLocal() as db:
+		titles = db.execute(
+			select(ScrapedResource.title)
+			.where(ScrapedResource.url.like("/q/%"))
+			.order_by(ScrapedResource.id)
+		).scalars().all()
+	assert titles == ["Quote 1", "Quote 2", "Quote 3", "Quote 4"]
+	saved = json.loads(path.read_text(encoding="utf-8"))
+	assert [i["title"] for i in saved] == titles
+
+
+class _SiteHandler(BaseHTTPRequestHandler):
+	etag = '"v1"'
+	hits: list[str] = []
+
+	def do_GET(self):
+		type(self).hits.append(self.path)
+		if self.path == "/robots.txt":
+			body = b"User-agent: *\nDisallow: /private/\n"
+			self.send_response(200)
+			self.send_header("Content-Type", "text/plain")
+		elif self.headers.get("If-None-Match") == self.etag:
+			self.send_response(304)
+			self.end_headers()
+			return
+		else:
+			page = self.path.strip("/").split("/")[-1]
+			body = (
+				f'<div class="quote"><span class="text">Quote {page}</span>'
+				f'<small class="author">Author</small></div>'
+			).encode("utf-8")
+			self.send_response(200)
+			self.send_header("Content-Type", "text/html; charset=utf-8")
+			self.send_header("ETag", self.etag)
+		self.send_header("Content-Length", str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+
+	def log_message(self, *args):
+		pass
+
+
+@pytest.fixture
+def local_site():
+	_SiteHandler.hits = []
+	server = ThreadingHTTPServer(("127.0.0.1", 0), _SiteHandler)
+	thread = threading.Thread(target=server.serve_forever, daemon=True)
+	thread.start()
+	scrape.clear_robots_cache()
+	yield f"http://127.0.0.1:{server.server_address[1]}/"
+	server.shutdown()
+	server.server_close()
+	scrape.clear_robots_cache()
+
+
+def test_robots_txt_is_parsed_once_per_host(local_site):
+	assert scrape.can_fetch(local_site, "test-agent", "/page/1/")
+	assert not scrape.can_fetch(local_site, "test-agent", "/private/x")
+	assert _SiteHandler.hits.count("/robots.txt") == 1
+
+	# An expired entry is fetched again
+	scrape.can_fetch(local_site, "test-agent", "/", ttl=0)
+	assert _SiteHandler.hits.count("/robots.txt") == 2
+
+
+def test_slow_robots_txt_does_not_block_other_hosts(local_site):
+	entered, release = threading.Event(), threading.Event()
+
+	class SlowRobots(BaseHTTPRequestHandler):
+		def do_GET(self):
+			entered.set()
+			release.wait(5)
+			self.send_response(404)
+			self.end_headers()
+
+		def log_message(self, *args):
+			pass
+
+	server = ThreadingHTTPServer(("127.0.0.1", 0), SlowRobots)
+	threading.Thread(target=server.serve_forever, daemon=True).start()
+	slow_host = f"http://127.0.0.1:{server.server_address[1]}/"
+	slow = threading.Thread(target=scrape.can_fetch, args=(slow_host, "test-agent", "/"))
+	try:
+		slow.start()
+		assert entered.wait(5)
+		assert scrape.can_fetch(local_site, "test-agent", "/page/1/")
+		assert slow.is_alive()  # still waiting on its own host
+	finally:
+		release.set()
+		slow.join(5)
+		server.shutdown()
+		server.server_close()
+
+
+def test_recrawl_uses_conditional_requests_and_cached_items(local_site, tmp_path, monkeypatch):
+	monkeypatch.setattr(scrape, "QUOTES_BASE", local_site)
+	cache = scrape.ResponseCache(tmp_path / "cache")
+
+	first = list(scrape.iter_items("quotes", 2, "test-agent", cache=cache))
+	assert [i.title for i in first] == ["Quote 1", "Quote 2"]
+
+	parsed = []
+	original = scrape.parse_quotes
+	monkeypatch.setattr(scrape, "parse_quotes", lambda *a: parsed.append(a) or original(*a))
+	pages = list(scrape.iter_pages("quotes", 2, "test-agent", cache=cache))
+	assert all(p.not_modified for p in pages)
+	second = list(scrape.iter_items("quotes", 2, "test-agent", cache=cache))
+	assert second == first
+	assert parsed == []
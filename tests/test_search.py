@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, update
+
+from app.db import SessionLocal, ensure_schema, init_db
+from app.main import app
+from app.models import ScrapedResource
+
+
+client = TestClient(app)
+
+
+def setup_module():
+	init_db()
+	items = [
+		{"source": "books", "title": "A Light in the Attic", "url": "/s/1", "category_or_author": "Poetry"},
+		{"source": "books", "title": "Light and Shadow", "url": "/s/2", "category_or_author": "Fiction"},
+		{"source": "books", "title": "Sapiens", "url": "/s/3", "category_or_author": "History"},
+		{"source": "quotes", "title": "The light within", "url": "/s/4", "category_or_author": "Albert Einstein"},
+	]
+	assert client.post("/scraped/import", json=items).status_code == 200
+
+
+def titles(resp) -> list[str]:
+	assert resp.status_code == 200, resp.text
+	return [hit["title"] for hit in resp.json()]
+
+
+def test_search_is_ranked_and_filterable():
+	resp = client.get("/scraped/search", params={"q": "light"})
+	hits = resp.json()
+	assert {hit["title"] for hit in hits} == {"A Light in the Attic", "Light and Shadow", "The light within"}
+	assert [hit["score"] for hit in hits] == sorted((hit["score"] for hit in hits), reverse=True)
+
+	assert titles(client.get("/scraped/search", params={"q": "light", "source": "quotes"})) == ["The light within"]
+	assert titles(
+		client.get("/scraped/search", params={"q": "light", "category_or_author": "Poetry"})
+	) == ["A Light in the Attic"]
+	# Authors are searchable too
+	assert titles(client.get("/scraped/search", params={"q": "einstein"})) == ["The light within"]
+	# FTS5 syntax in user input is treated as plain words
+	assert titles(client.get("/scraped/search", params={"q": 'sapiens" OR NEAR('})) == []
+	assert titles(client.get("/scraped/search", params={"q": "sapiens"})) == ["Sapiens"]
+
+
+def test_search_index_follows_updates_and_deletes():
+	with SessionLocal() as db:
+		db.execute(update(ScrapedResource).where(ScrapedResource.url == "/s/3").values(title="Homo Deus"))
+		db.commit()
+	assert titles(client.get("/scraped/search", params={"q": "sapiens"})) == []
+	assert titles(client.get("/scraped/search", params={"q": "deus"})) == ["Homo Deus"]
+
+	with SessionLocal() as db:
+		db.execute(delete(ScrapedResource).where(ScrapedResource.url == "/s/3"))
+		db.commit()
+	assert titles(client.get("/scraped/search", params={"q": "deus"})) == []
+	assert ensure_schema() is False